@@ -0,0 +1,13 @@
+import pytest
+
+
+# Reports of the driver pools, shown after the run instead of in captured fixture output
+POOL_REPORTS = pytest.StashKey[list]()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    reports = config.stash.get(POOL_REPORTS, [])
+    if reports:
+        terminalreporter.section("driver pool")
+        for report in reports:
+            terminalreporter.write_line(report)
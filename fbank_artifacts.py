@@ -0,0 +1,148 @@
+"""Failure artifacts for the F-Bank autotests, written off the test thread.
+
+When a test fails, the test thread only grabs what must come from the
+browser at that moment: a screenshot, the outerHTML of the transfer form
+(or #root), and the console and performance (CDP network) logs when the
+launch profile enables them. Decoding, trimming, compressing and writing
+happen in a small background pool, and the store keeps only the newest
+failures within a count and size limit.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+from fbank_cache import CACHE_DIR
+from fbank_selectors import DOM_HELPERS
+
+
+ARTIFACT_DIR = os.environ.get("FBANK_ARTIFACT_DIR", os.path.join(CACHE_DIR, "artifacts"))
+MAX_DOM_CHARS = 200_000
+
+DOM_SCRIPT = DOM_HELPERS + """
+const [candidates] = arguments;
+const field = pickFirst(candidates, 'present', null);
+const root = field && field[1].closest('form, section, main, #root') || document.getElementById('root')
+    || document.body;
+return root ? root.outerHTML : null;
+"""
+
+_rotate_lock = threading.Lock()
+
+
+def trim_dom(html):
+    """Drop script/style bodies and comments, then cap the size"""
+    html = re.sub(r"(<(script|style)\b[^>]*>).*?(</\2>)", r"\1\3", html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r"<!--.*?-->", "", html, flags=re.DOTALL)
+    if len(html) > MAX_DOM_CHARS:
+        html = html[:MAX_DOM_CHARS] + "\n<!-- truncated -->"
+    return html
+
+
+def network_events(entries):
+    """CDP Network.* events out of the performance log"""
+    events = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method", "").startswith("Network."):
+            events.append(message)
+    return events
+
+
+class ArtifactStore:
+    def __init__(self, root=ARTIFACT_DIR, max_failures=50, max_bytes=200 * 1024 * 1024, workers=2):
+        self.root = root
+        self.max_failures = max_failures
+        self.max_bytes = max_bytes
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifacts")
+        self.futures = []
+
+    def capture(self, driver, test_name, info, candidates=()):
+        """Grab raw artifacts on the calling thread and queue the rest; returns the target directory"""
+        raw = {}
+        for kind, grab in (
+            ("screenshot", driver.get_screenshot_as_base64),
+            ("dom", lambda: driver.execute_script(DOM_SCRIPT, list(candidates))),
+            ("console", lambda: driver.get_log("browser")),
+            ("performance", lambda: driver.get_log("performance")),
+        ):
+            try:
+                raw[kind] = grab()
+            except Exception as e:
+                # get_log fails unless the profile enabled logging; keep going with the rest
+                raw[kind] = None
+                info.setdefault("capture_errors", {})[kind] = str(e).splitlines()[0] if str(e) else repr(e)
+
+        directory = os.path.join(self.root, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-"
+                                            f"{threading.get_ident()}-{test_name}")
+        info = dict(info, test=test_name, url=self.current_url(driver), captured_at=time.time())
+        self.futures.append(self.executor.submit(self.write, directory, raw, info))
+        return directory
+
+    def reset_logs(self, driver):
+        """Drop buffered log entries so the next capture holds only the current test's"""
+        for log_type in ("browser", "performance"):
+            try:
+                driver.get_log(log_type)
+            except Exception:
+                pass
+
+    def current_url(self, driver):
+        try:
+            return driver.current_url
+        except Exception:
+            return None
+
+    def write(self, directory, raw, info):
+        os.makedirs(directory, exist_ok=True)
+        if raw["screenshot"]:
+            with open(os.path.join(directory, "screenshot.png"), "wb") as f:
+                f.write(base64.b64decode(raw["screenshot"]))
+        if raw["dom"]:
+            with gzip.open(os.path.join(directory, "dom.html.gz"), "wt", encoding="utf-8") as f:
+                f.write(trim_dom(raw["dom"]))
+        if raw["console"] is not None:
+            with gzip.open(os.path.join(directory, "console.json.gz"), "wt", encoding="utf-8") as f:
+                json.dump(raw["console"], f, ensure_ascii=False)
+        if raw["performance"] is not None:
+            with gzip.open(os.path.join(directory, "network.json.gz"), "wt", encoding="utf-8") as f:
+                json.dump(network_events(raw["performance"]), f, ensure_ascii=False)
+        with open(os.path.join(directory, "info.json"), "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False, indent=2)
+        self.rotate()
+
+    def rotate(self):
+        """Delete the oldest failure directories beyond the count or size limit"""
+        with _rotate_lock:
+            try:
+                entries = [os.path.join(self.root, name) for name in os.listdir(self.root)]
+            except OSError:
+                return
+            entries = sorted((path for path in entries if os.path.isdir(path)), key=os.path.getmtime,
+                             reverse=True)
+
+            total = 0
+            for index, path in enumerate(entries):
+                try:
+                    total += sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+                except OSError:
+                    continue
+                if index >= self.max_failures or total > self.max_bytes:
+                    shutil.rmtree(path, ignore_errors=True)
+
+    def close(self):
+        """Wait for queued writes; report any that failed"""
+        for future in self.futures:
+            error = future.exception()
+            if error:
+                print(f"Failed to write failure artifacts: {error}")
+        self.futures = []
+        self.executor.shutdown(wait=True)
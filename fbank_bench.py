@@ -0,0 +1,194 @@
+"""Benchmark mode for the F-Bank test harness with baseline regression checks.
+
+Each scenario runs K times against a fixed local target (the stand-in
+server unless --url is given): browser startup, FBT-006..FBT-010, the
+enter_amount and commission-read paths, and test_1..test_5 of the pytest
+suite. Wall time and WebDriver command counts are recorded per test and
+per helper, and their medians are compared to a committed baseline file
+(bench_baseline.json next to this module, written with --update-baseline
+on the machine that runs the gate). A missing baseline fails the run
+unless --allow-missing-baseline is given.
+"""
+from statistics import median
+import argparse
+import json
+import os
+import sys
+import time
+
+from Berezhnaya_SECOND import TEST_METHODS, FBankAutotests
+from fbank_browser import LaunchProfile, profile_startup
+from fbank_server import StandInServer
+from fbank_timeouts import TimeoutManager
+from fbank_timing import StepTimer, count_commands
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+# Wall-time noise below this many seconds never counts as a regression
+WALL_SLACK = 0.05
+MICRO_REPEATS = 10
+
+BENCH_HELPERS = ["driver_start", "navigation", "open_transfer_form", "enter_card_number",
+                 "enter_amount", "get_commission_value", "is_transfer_possible",
+                 "probe_amounts", "restore_transfer_form", "selector", "wait"]
+
+PYTEST_TESTS = ["test_1_page_loading", "test_2_interface_display", "test_3_button_interaction",
+                "test_4_input_fields", "test_5_page_navigation"]
+
+
+def collect_events(metrics, prefix, events):
+    """Add wall time and command count per event to metrics[prefix.step.*]"""
+    for event in events:
+        metrics.setdefault(f"{prefix}.{event['step']}.wall", []).append(event["duration"])
+        metrics.setdefault(f"{prefix}.{event['step']}.commands", []).append(event["commands"])
+
+
+def bench_startup(metrics, profile, url):
+    timings = profile_startup(profile, url)
+    for key, value in timings.items():
+        metrics.setdefault(f"startup.{key}.wall", []).append(value)
+
+
+def bench_autotests(metrics, profile, url):
+    tester = FBankAutotests(url, profile)
+    if not tester.setup():
+        raise RuntimeError("Failed to initialize test environment")
+
+    try:
+        for test_name in TEST_METHODS:
+            tester.run_test(test_name)
+
+        for event in tester.timer.events:
+            if event["step"] == "test":
+                metrics.setdefault(f"{event['test']}.wall", []).append(event["duration"])
+                metrics.setdefault(f"{event['test']}.commands", []).append(event["commands"])
+        collect_events(metrics, "helper",
+                       [event for event in tester.timer.events if event["step"] in BENCH_HELPERS])
+
+        # Round trips of the single-amount path and the commission read in isolation
+        tester.timer.events = []
+        tester.restore_transfer_form()
+        for repeat in range(MICRO_REPEATS):
+            tester.enter_amount(str(1000 + repeat))
+            tester.get_commission_value()
+        tester.probe_amounts([str(1000 + repeat) for repeat in range(MICRO_REPEATS)])
+        collect_events(metrics, "micro",
+                       [event for event in tester.timer.events
+                        if event["step"] in ("enter_amount", "get_commission_value", "probe_amounts")])
+    finally:
+        tester.teardown()
+
+
+def bench_pytest_suite(metrics, profile, url):
+    # Imported here: the pytest module only needs to load when this scenario runs
+    from zhilkina_first_test import DriverPool, TestFBank
+
+    pool = DriverPool(url, profile=profile)
+    timer = StepTimer()
+    # No latency history: every run waits with the same ceiling
+    timeouts = TimeoutManager(url, path=os.devnull)
+    try:
+        for test_name in PYTEST_TESTS:
+            # The pool's reset happens outside the measured test, as in the fixture
+            case = TestFBank()
+            case.driver = count_commands(pool.acquire(), timer)
+            case.base_url = url
+            case.timeouts = timeouts
+            case.timer = None
+            timer.current_test = test_name
+            with timer.step("test"):
+                try:
+                    getattr(case, test_name)()
+                except AssertionError as e:
+                    print(f"{test_name} failed during benchmark: {e}")
+    finally:
+        pool.recycle()
+
+    for event in timer.events:
+        metrics.setdefault(f"{event['test']}.wall", []).append(event["duration"])
+        metrics.setdefault(f"{event['test']}.commands", []).append(event["commands"])
+
+
+def run_benchmarks(url, runs, profile):
+    metrics = {}
+    for run in range(runs):
+        start = time.perf_counter()
+        bench_startup(metrics, profile, url)
+        bench_autotests(metrics, profile, url)
+        bench_pytest_suite(metrics, profile, url)
+        print(f"Run {run + 1}/{runs} finished in {time.perf_counter() - start:.2f}s")
+
+    return {key: median(values) for key, values in sorted(metrics.items())}
+
+
+def compare(current, baseline, threshold):
+    """Metrics that got worse than baseline * (1 + threshold); returns (key, baseline, current) rows"""
+    regressions = []
+    for key, expected in sorted(baseline.items()):
+        if key not in current:
+            continue
+        actual = current[key]
+        limit = expected * (1 + threshold)
+        if key.endswith(".wall"):
+            limit = max(limit, expected + WALL_SLACK)
+        if actual > limit:
+            regressions.append((key, expected, actual))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the F-Bank test harness")
+    parser.add_argument("--runs", type=int, default=5, help="repetitions per scenario (K)")
+    parser.add_argument("--url", help="target page; defaults to a local stand-in server")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="succeed without a comparison when there is no baseline yet")
+    args = parser.parse_args(argv)
+
+    profile = LaunchProfile.from_env()
+    server = None
+    url = args.url
+    if url is None:
+        server = StandInServer().start()
+        url = server.page_url()
+
+    try:
+        current = run_benchmarks(url, args.runs, profile)
+    finally:
+        if server:
+            server.stop()
+
+    print(f"\n{'metric':<50} {'median':>10}")
+    for key, value in current.items():
+        unit = "s" if key.endswith(".wall") else ""
+        print(f"{key:<50} {value:>9.3f}{unit}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+        return True
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except OSError:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one")
+        return args.allow_missing_baseline
+
+    regressions = compare(current, baseline, args.threshold)
+    if not regressions:
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+        return True
+
+    print(f"\nRegressions against {args.baseline} (threshold {args.threshold:.0%}):")
+    for key, expected, actual in regressions:
+        print(f"- {key}: {expected:.3f} -> {actual:.3f}")
+    return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
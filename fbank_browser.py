@@ -0,0 +1,188 @@
+"""Browser launch profiles and startup profiling for the F-Bank autotests.
+
+A LaunchProfile picks Chrome or Firefox and switches on headless mode, a fixed window size, a
+persistent profile or disk cache directory, CDP-level blocking of
+heavy resource types and console/performance logging for failure
+artifacts (both Chrome only). The defaults reproduce the original
+headed, maximized Chrome. Running this module compares the options by driver
+spawn, first navigation and first interactive #root > * times.
+"""
+from statistics import median
+import argparse
+import os
+import time
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# Network.setBlockedURLs matches URL patterns, so resource types map to extensions
+BLOCKABLE_RESOURCES = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav"],
+    "stylesheet": ["*.css"],
+}
+
+
+class LaunchProfile:
+    def __init__(self, headless=False, window_size=None, profile_dir=None, cache_dir=None, block=(), logs=False,
+                 browser="chrome"):
+        self.browser = browser
+        self.headless = headless
+        self.window_size = window_size
+        self.profile_dir = profile_dir
+        self.cache_dir = cache_dir
+        self.block = tuple(block)
+        self.logs = logs
+
+    @classmethod
+    def from_env(cls):
+        """FBANK_BROWSER=chrome|firefox, FBANK_HEADLESS=1, FBANK_WINDOW_SIZE=1366x900, FBANK_PROFILE_DIR, FBANK_DISK_CACHE_DIR,
+        FBANK_BLOCK_RESOURCES=image,font,media, FBANK_CAPTURE_LOGS=1"""
+        window_size = os.environ.get("FBANK_WINDOW_SIZE")
+        block = os.environ.get("FBANK_BLOCK_RESOURCES", "")
+        return cls(
+            headless=os.environ.get("FBANK_HEADLESS") == "1",
+            window_size=tuple(int(part) for part in window_size.split("x")) if window_size else None,
+            profile_dir=os.environ.get("FBANK_PROFILE_DIR"),
+            cache_dir=os.environ.get("FBANK_DISK_CACHE_DIR"),
+            block=[name for name in block.split(",") if name],
+            logs=os.environ.get("FBANK_CAPTURE_LOGS") == "1",
+            browser=os.environ.get("FBANK_BROWSER", "chrome"),
+        )
+
+    def with_browser(self, browser, headless=None):
+        """Copy of this profile for another browser"""
+        return LaunchProfile(self.headless if headless is None else headless, self.window_size, self.profile_dir,
+                             self.cache_dir, self.block, self.logs, browser)
+
+    def describe(self):
+        parts = [self.browser, "headless" if self.headless else "headed"]
+        if self.window_size:
+            parts.append("%dx%d" % self.window_size)
+        if self.profile_dir:
+            parts.append(f"profile={self.profile_dir}")
+        if self.cache_dir:
+            parts.append(f"cache={self.cache_dir}")
+        if self.block:
+            parts.append("block=" + ",".join(self.block))
+        if self.logs:
+            parts.append("logs")
+        return " ".join(parts)
+
+    def options(self):
+        if self.browser == "firefox":
+            return self.firefox_options()
+        return self.chrome_options()
+
+    def firefox_options(self):
+        options = webdriver.FirefoxOptions()
+        if self.headless:
+            options.add_argument("-headless")
+        if self.window_size:
+            options.add_argument("--width=%d" % self.window_size[0])
+            options.add_argument("--height=%d" % self.window_size[1])
+        if self.profile_dir:
+            options.add_argument("-profile")
+            options.add_argument(os.path.abspath(self.profile_dir))
+        if self.cache_dir:
+            options.set_preference("browser.cache.disk.parent_directory", os.path.abspath(self.cache_dir))
+        return options
+
+    def chrome_options(self):
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.window_size:
+            options.add_argument("--window-size=%d,%d" % self.window_size)
+        # Chrome locks a user data dir, so a profile dir suits serial runs only;
+        # the disk cache dir can be shared across runs and workers
+        if self.profile_dir:
+            options.add_argument(f"--user-data-dir={os.path.abspath(self.profile_dir)}")
+        if self.cache_dir:
+            options.add_argument(f"--disk-cache-dir={os.path.abspath(self.cache_dir)}")
+        if self.logs:
+            # Console messages and CDP Network.* events, read with driver.get_log()
+            options.set_capability("goog:loggingPrefs", {"browser": "ALL", "performance": "ALL"})
+        return options
+
+
+def create_driver(profile=None):
+    """Launch the profile's browser (LaunchProfile.from_env() by default)"""
+    profile = profile or LaunchProfile.from_env()
+    if profile.browser == "firefox":
+        driver = webdriver.Firefox(options=profile.options())
+    elif profile.browser == "chrome":
+        driver = webdriver.Chrome(options=profile.options())
+    else:
+        raise ValueError(f"Unsupported browser: {profile.browser}")
+
+    if not profile.headless and not profile.window_size:
+        driver.maximize_window()
+
+    # Resource blocking goes through CDP, which only Chrome exposes
+    if profile.block and profile.browser == "chrome":
+        patterns = [pattern for name in profile.block for pattern in BLOCKABLE_RESOURCES[name]]
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+    return driver
+
+
+def profile_startup(profile, url, timeout=10):
+    """Seconds for driver spawn, first navigation and first interactive #root > *"""
+    start = time.perf_counter()
+    driver = create_driver(profile)
+    spawned = time.perf_counter()
+
+    try:
+        driver.get(url)
+        navigated = time.perf_counter()
+        WebDriverWait(driver, timeout).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "#root > *"))
+        )
+        interactive = time.perf_counter()
+    finally:
+        driver.quit()
+
+    return {
+        "spawn": spawned - start,
+        "first_navigation": navigated - spawned,
+        "first_interactive": interactive - navigated,
+        "total": interactive - start,
+    }
+
+
+def compare_profiles(profiles, url, runs=3):
+    """Median startup timings for each named profile"""
+    print(f"{'profile':<40} {'spawn':>8} {'navigate':>9} {'interactive':>12} {'total':>8}")
+    summary = {}
+    for name, profile in profiles.items():
+        timings = [profile_startup(profile, url) for _ in range(runs)]
+        summary[name] = {key: median(t[key] for t in timings) for key in timings[0]}
+        row = summary[name]
+        print(f"{name:<40} {row['spawn']:>7.2f}s {row['first_navigation']:>8.2f}s "
+              f"{row['first_interactive']:>11.2f}s {row['total']:>7.2f}s")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Chrome launch options for the F-Bank suites")
+    parser.add_argument("--url", default="http://localhost:3000")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--cache-dir", default=os.path.join(".fbank_cache", "chrome-disk-cache"))
+    args = parser.parse_args()
+
+    fast_block = ("image", "font", "media")
+    compare_profiles({
+        "default (headed, maximized)": LaunchProfile(),
+        "headless": LaunchProfile(headless=True),
+        "headless + fixed window": LaunchProfile(headless=True, window_size=(1366, 900)),
+        "headless + window + disk cache": LaunchProfile(headless=True, window_size=(1366, 900),
+                                                        cache_dir=args.cache_dir),
+        "headless + window + cache + blocking": LaunchProfile(headless=True, window_size=(1366, 900),
+                                                              cache_dir=args.cache_dir, block=fast_block),
+    }, args.url, args.runs)
@@ -0,0 +1,37 @@
+"""On-disk JSON stores the F-Bank runners keep between runs.
+
+Selector winners, wait latencies, test durations, flake outcomes and
+case and grid results each live in one JSON file under CACHE_DIR.
+Parallel workers and processes share those files, so a save re-reads the
+file, merges its own changes into what is there and replaces it
+atomically.
+"""
+import json
+import os
+import threading
+
+
+CACHE_DIR = os.environ.get("FBANK_CACHE_DIR", ".fbank_cache")
+
+_store_lock = threading.Lock()
+
+
+def load_store(path):
+    """Contents of a store; {} when it is missing or unreadable"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def update_store(path, merge, **dump_options):
+    """Replace a store with merge(current contents) and return what was written"""
+    with _store_lock:
+        contents = merge(load_store(path))
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(contents, f, **dump_options)
+        os.replace(tmp_path, path)
+        return contents
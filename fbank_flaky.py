@@ -0,0 +1,53 @@
+"""Flake tracking and quarantine for the FBT tests.
+
+A failed test is retried right away in the same, already warm browser.
+Each run ends in one outcome per test: "pass" (first attempt), "flaky"
+(failed, then passed on a retry) or "fail" (failed every attempt, a
+deterministic failure). Outcomes are kept per test across runs; a test
+whose recent flake rate reaches the threshold is quarantined and runs in
+a separate pass after the main suite has reported, without affecting its
+result, until its rate drops again.
+"""
+import os
+
+from fbank_cache import CACHE_DIR, load_store, update_store
+
+
+FLAKE_HISTORY = os.path.join(CACHE_DIR, "flakes.json")
+
+
+class FlakeTracker:
+    def __init__(self, path=FLAKE_HISTORY, threshold=0.2, min_runs=3, window=20):
+        self.path = path
+        self.threshold = threshold
+        self.min_runs = min_runs
+        self.window = window
+        self.outcomes = load_store(self.path)
+        self.recorded = {}
+
+    def save(self):
+        def merge(outcomes):
+            for test, recorded in self.recorded.items():
+                outcomes[test] = (outcomes.get(test, []) + recorded)[-self.window:]
+            return outcomes
+
+        self.outcomes = update_store(self.path, merge)
+        self.recorded = {}
+
+    def record(self, test, attempts, passed):
+        outcome = "fail" if not passed else "flaky" if attempts > 1 else "pass"
+        self.recorded.setdefault(test, []).append(outcome)
+        return outcome
+
+    def flake_rate(self, test):
+        outcomes = self.outcomes.get(test, [])[-self.window:]
+        return outcomes.count("flaky") / len(outcomes) if outcomes else 0.0
+
+    def quarantined(self, test):
+        runs = len(self.outcomes.get(test, []))
+        return runs >= self.min_runs and self.flake_rate(test) >= self.threshold
+
+    def split(self, tests):
+        """(main tests, quarantined tests), both in the given order"""
+        quarantined = [test for test in tests if self.quarantined(test)]
+        return [test for test in tests if test not in quarantined], quarantined
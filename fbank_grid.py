@@ -0,0 +1,181 @@
+"""Parameter-space fan-out over balance, reserved and amount.
+
+The availability rule (amount + commission <= balance - reserved) is
+checked well beyond the single ?balance=30000&reserved=20001 point: a grid
+of account states around zero, reserved equal to or above the balance
+and large values, each with the amounts around its affordability
+boundary. Account states are spread over parallel browsers, one page load
+and one batched probe each, and compared with fbank_sweep.reference.
+Observed values are memoized per (app fingerprint, balance, reserved,
+amount), so a grown grid only drives the new points.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlparse
+import os
+import queue
+
+from fbank_cache import CACHE_DIR, load_store, update_store
+from fbank_incremental import app_fingerprint
+from fbank_sweep import reference
+
+
+GRID_CACHE = os.path.join(CACHE_DIR, "grid.json")
+DEFAULT_BALANCES = [0, 1, 10, 100, 20001, 30000, 1_000_000, 1_000_000_000]
+
+
+def max_affordable(balance, reserved):
+    """Largest amount whose amount + amount // 10 still fits into balance - reserved"""
+    available = balance - reserved
+    if available <= 0:
+        return 0
+    amount = available * 10 // 11
+    while amount + 1 + (amount + 1) // 10 <= available:
+        amount += 1
+    while amount + amount // 10 > available:
+        amount -= 1
+    return amount
+
+
+def account_states(balances):
+    states = []
+    for balance in balances:
+        for reserved in sorted({0, 1, balance // 2, balance - 1, balance, balance + 1}):
+            if reserved >= 0:
+                states.append((balance, reserved))
+    return states
+
+
+def grid_amounts(balance, reserved):
+    """Small amounts, commission rounding steps and both sides of the affordability boundary"""
+    boundary = max_affordable(balance, reserved)
+    amounts = {0, 1, 9, 10, 11, 19, 20, boundary - 1, boundary, boundary + 1, boundary + 10, 10 * balance + 10}
+    return sorted(amount for amount in amounts if amount >= 0)
+
+
+def build_grid(balances=DEFAULT_BALANCES):
+    """{(balance, reserved): [amounts]}"""
+    return {state: grid_amounts(*state) for state in account_states(balances)}
+
+
+class GridCache:
+    def __init__(self, app, path=GRID_CACHE):
+        self.app = app
+        self.path = path
+        self.points = load_store(self.path)
+        self.updated = {}
+
+    def save(self):
+        if self.updated:
+            update_store(self.path, lambda points: dict(points, **self.updated))
+
+    def key(self, balance, reserved, amount):
+        return f"{self.app}:{balance}:{reserved}:{amount}"
+
+    def get(self, balance, reserved, amount):
+        if self.app is None:
+            return None
+        key = self.key(balance, reserved, amount)
+        return self.updated.get(key) or self.points.get(key)
+
+    def put(self, balance, reserved, amount, value):
+        if self.app is not None:
+            self.updated[self.key(balance, reserved, amount)] = value
+
+
+def probe_state(tester, balance, reserved, amounts):
+    """{amount: {commission, possible, error}} for one account state, or None"""
+    parsed = urlparse(tester.base_url)
+    tester.driver.get(f"{parsed.scheme}://{parsed.netloc}/?{urlencode({'balance': balance, 'reserved': reserved})}")
+    tester.checkpoint = None
+    if not tester.open_transfer_form() or not tester.enter_card_number():
+        return None
+
+    results = tester.probe_amounts(amounts)
+    if results is None:
+        return None
+    return {amount: {"commission": result["commission"],
+                     "possible": result["transfer_possible"] and result["error_text"] is None,
+                     "error": result["error_text"]}
+            for amount, result in zip(amounts, results)}
+
+
+def grid_worker(tester, pending, observed, failed):
+    if not tester.setup():
+        return
+    try:
+        while True:
+            try:
+                (balance, reserved), amounts = pending.get_nowait()
+            except queue.Empty:
+                return
+            values = probe_state(tester, balance, reserved, amounts)
+            if values is None:
+                failed.append((balance, reserved))
+                continue
+            for amount, value in values.items():
+                observed[(balance, reserved, amount)] = value
+    finally:
+        tester.teardown()
+
+
+def run_grid(tester, workers=4, balances=DEFAULT_BALANCES):
+    """Probe the grid's uncached points in parallel and compare every point with the reference"""
+    print("F-BANK PARAMETER GRID")
+    print("=" * 70)
+
+    if not tester.check_target():
+        return False
+
+    cache = GridCache(app_fingerprint(tester.base_url))
+    grid = build_grid(balances)
+    observed = {}
+    pending = queue.Queue()
+    for (balance, reserved), amounts in grid.items():
+        missing = []
+        for amount in amounts:
+            value = cache.get(balance, reserved, amount)
+            if value is None:
+                missing.append(amount)
+            else:
+                observed[(balance, reserved, amount)] = value
+        if missing:
+            pending.put(((balance, reserved), missing))
+
+    total = sum(len(amounts) for amounts in grid.values())
+    print(f"{total} points in {len(grid)} account states: {len(observed)} cached, "
+          f"{total - len(observed)} to probe in {pending.qsize()} page loads")
+
+    failed = []
+    if not pending.empty():
+        workers = max(1, min(workers, pending.qsize()))
+        testers = [type(tester)(tester.base_url, tester.profile) for _ in range(workers)]
+        cached = set(observed)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(grid_worker, worker, pending, observed, failed) for worker in testers]:
+                future.result()
+        # States left over when every browser failed to start
+        while not pending.empty():
+            failed.append(pending.get_nowait()[0])
+        for point, value in observed.items():
+            if point not in cached:
+                cache.put(*point, value)
+        cache.save()
+
+    mismatches = 0
+    for (balance, reserved), amounts in grid.items():
+        if (balance, reserved) in failed:
+            print(f"- balance={balance} reserved={reserved}: failed to probe the form")
+            continue
+        expected_commission, expected_possible = reference(amounts, balance, reserved)
+        for amount, commission, possible in zip(amounts, expected_commission.tolist(), expected_possible.tolist()):
+            value = observed.get((balance, reserved, amount))
+            if value is None:
+                continue
+            if value["commission"] != commission or value["possible"] != possible:
+                mismatches += 1
+                print(f"- balance={balance} reserved={reserved} amount={amount}: app commission "
+                      f"{value['commission']}, {'possible' if value['possible'] else 'blocked'}; expected "
+                      f"{commission}, {'possible' if possible else 'blocked'}")
+
+    print(f"\nGrid: {total} points, {mismatches} mismatches, {len(failed)} account states not probed")
+    return mismatches == 0 and not failed and len(observed) == total
@@ -0,0 +1,81 @@
+"""Incremental re-runs: skip test cases whose outcome cannot have changed.
+
+A case is keyed by a content hash of its compiled scenario (from the
+markdown test cases), the harness code and a fingerprint of the app the
+target serves (page HTML plus same-origin scripts and stylesheets).
+Passing outcomes are stored under that key; on the next run with
+--changed-only a case with the same key is reported from the cache
+instead of being driven in a browser. Failures are never cached.
+"""
+from urllib.parse import urljoin
+from urllib.request import urlopen
+import glob
+import hashlib
+import os
+
+from fbank_cache import CACHE_DIR, load_store, update_store
+from fbank_load import same_origin_assets
+
+
+CASE_CACHE = os.path.join(CACHE_DIR, "cases.json")
+HARNESS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def harness_fingerprint():
+    """Hash of the runner and every fbank_* module it is built from"""
+    digest = hashlib.sha256()
+    paths = [os.path.join(HARNESS_DIR, "Berezhnaya_SECOND.py")]
+    paths += sorted(glob.glob(os.path.join(HARNESS_DIR, "fbank_*.py")))
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def app_fingerprint(page_url, timeout=5.0):
+    """Hash of the served page and its same-origin bundle; None if it cannot be fetched"""
+    digest = hashlib.sha256()
+    try:
+        with urlopen(page_url, timeout=timeout) as response:
+            html = response.read()
+        digest.update(html)
+        for asset in same_origin_assets(page_url, html.decode("utf-8", "replace")):
+            with urlopen(urljoin(page_url, asset), timeout=timeout) as response:
+                digest.update(asset.encode())
+                digest.update(response.read())
+    except OSError as e:
+        print(f"Could not fingerprint {page_url}: {e}")
+        return None
+    return digest.hexdigest()
+
+
+class CaseCache:
+    def __init__(self, app, path=CASE_CACHE, harness=None):
+        self.app = app
+        self.path = path
+        self.harness = harness or harness_fingerprint()
+        self.entries = load_store(self.path)
+        self.updated = {}
+
+    def save(self):
+        if self.updated:
+            update_store(self.path, lambda entries: dict(entries, **self.updated), ensure_ascii=False)
+
+    def key(self, scenario):
+        digest = hashlib.sha256()
+        for part in (scenario.fingerprint(), self.harness, self.app):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def lookup(self, scenario):
+        """Records of the last passing run of this exact case, or None"""
+        if self.app is None:
+            return None
+        return self.entries.get(self.key(scenario))
+
+    def store(self, scenario, records):
+        if self.app is None or not records or not all(record["passed"] for record in records):
+            return
+        self.updated[self.key(scenario)] = records
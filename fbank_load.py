@@ -0,0 +1,237 @@
+"""Browserless HTTP load generation built on the FBT-006..FBT-010 scenarios.
+
+Each simulated user replays a scenario at the HTTP level: the page with
+its ?balance=&reserved= parameters, the same-origin scripts and
+stylesheets it references, and (if the backend exposes one) a commission
+request per probed amount. Users arrive at a fixed rate and share a pool
+of keep-alive connections; the report gives throughput and latency
+percentiles per request kind.
+"""
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+
+from fbank_scenarios import SCENARIOS
+from fbank_timing import percentile
+
+
+class AssetParser(HTMLParser):
+    """Collects script and stylesheet URLs referenced by a page"""
+
+    def __init__(self):
+        super().__init__()
+        self.assets = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("src"):
+            self.assets.append(attrs["src"])
+        elif tag == "link" and "stylesheet" in (attrs.get("rel") or "") and attrs.get("href"):
+            self.assets.append(attrs["href"])
+
+
+def same_origin_assets(page_url, html):
+    parser = AssetParser()
+    parser.feed(html)
+    origin = urlparse(page_url).netloc
+    paths = []
+    for asset in parser.assets:
+        url = urlparse(urljoin(page_url, asset))
+        if url.netloc == origin:
+            paths.append(url.path + (f"?{url.query}" if url.query else ""))
+    return paths
+
+
+async def read_response(reader):
+    """(status, headers, body) of one HTTP/1.1 response"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed by server")
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b"".join(chunks)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+        headers["connection"] = "close"
+    return status, headers, body
+
+
+class ConnectionPool:
+    """At most `size` keep-alive connections to one host, reused LIFO"""
+
+    def __init__(self, host, port, size):
+        self.host = host
+        self.port = port
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+        self.opened = 0
+
+    async def get(self, path):
+        async with self.slots:
+            if self.idle:
+                reader, writer = self.idle.pop()
+                try:
+                    return await self.request(reader, writer, path)
+                except (OSError, ConnectionError, asyncio.IncompleteReadError):
+                    # The server may have closed the connection while it sat idle
+                    pass
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            self.opened += 1
+            return await self.request(reader, writer, path)
+
+    async def request(self, reader, writer, path):
+        try:
+            writer.write((f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                          f"Connection: keep-alive\r\nAccept-Encoding: identity\r\n\r\n").encode("latin-1"))
+            await writer.drain()
+            status, headers, body = await read_response(reader)
+        except Exception:
+            writer.close()
+            raise
+
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+        else:
+            self.idle.append((reader, writer))
+        return status, body
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.scenarios = []
+
+    def record(self, kind, seconds, ok):
+        self.latencies.setdefault(kind, []).append(seconds)
+        if not ok:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+async def timed_get(pool, stats, kind, path):
+    start = time.perf_counter()
+    try:
+        status, body = await pool.get(path)
+    except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+        stats.record(kind, time.perf_counter() - start, False)
+        return None
+    stats.record(kind, time.perf_counter() - start, status < 400)
+    return body if status < 400 else None
+
+
+async def replay(pool, stats, scenario, page_url, commission_path):
+    """One simulated user walking through a scenario"""
+    start = time.perf_counter()
+    page_path = f"/{scenario.query()}"
+    body = await timed_get(pool, stats, "page", page_path)
+
+    if body is not None:
+        assets = same_origin_assets(urljoin(page_url, page_path), body.decode("utf-8", "replace"))
+        await asyncio.gather(*(timed_get(pool, stats, "asset", asset) for asset in assets))
+
+    if commission_path:
+        for amount, _, _ in scenario.probes:
+            await timed_get(pool, stats, "commission", commission_path.format(
+                amount=amount, balance=scenario.balance, reserved=scenario.reserved))
+
+    stats.scenarios.append(time.perf_counter() - start)
+
+
+async def generate_load(page_url, rate, duration, connections, commission_path, scenarios=SCENARIOS):
+    parsed = urlparse(page_url)
+    pool = ConnectionPool(parsed.hostname, parsed.port or 80, connections)
+    stats = LoadStats()
+    users = []
+
+    # Open-loop arrivals: a new user every 1/rate seconds regardless of how
+    # quickly earlier users finish, so server slowdowns show up as latency
+    start = time.perf_counter()
+    for index, scenario in enumerate(itertools.cycle(scenarios)):
+        due = start + index / rate
+        if due - start >= duration:
+            break
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        users.append(asyncio.create_task(replay(pool, stats, scenario, page_url, commission_path)))
+
+    await asyncio.gather(*users)
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return stats, elapsed, pool.opened
+
+
+def print_report(stats, elapsed, opened):
+    total = sum(len(values) for values in stats.latencies.values())
+    errors = sum(stats.errors.values())
+    print("\nLOAD TEST SUMMARY")
+    print("=" * 70)
+    print(f"Users: {len(stats.scenarios)} in {elapsed:.2f}s ({len(stats.scenarios) / elapsed:.1f} scenarios/s)")
+    print(f"Requests: {total} ({total / elapsed:.1f} req/s), errors: {errors}, connections opened: {opened}")
+
+    rows = dict(stats.latencies, scenario=stats.scenarios)
+    print(f"\n{'kind':<12} {'count':>7} {'errors':>7} {'p50':>9} {'p90':>9} {'p95':>9} {'p99':>9}")
+    for kind, values in rows.items():
+        cells = " ".join(f"{percentile(values, pct) * 1000:>7.1f}ms" for pct in (50, 90, 95, 99))
+        print(f"{kind:<12} {len(values):>7} {stats.errors.get(kind, 0):>7} {cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP load test replaying the F-Bank scenarios")
+    parser.add_argument("--url", default="http://localhost:8000/", help="origin of the app under load")
+    parser.add_argument("--local", action="store_true", help="target a local stand-in server instead")
+    parser.add_argument("--rate", type=float, default=20, help="new users per second")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of arrivals")
+    parser.add_argument("--connections", type=int, default=16, help="keep-alive connection pool size")
+    parser.add_argument("--commission-path",
+                        help="backend commission request per probe, e.g. "
+                             "'/api/commission?amount={amount}&balance={balance}&reserved={reserved}'")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if args.local:
+        from fbank_server import StandInServer
+
+        server = StandInServer().start()
+        url = server.url + "/"
+
+    try:
+        stats, elapsed, opened = asyncio.run(
+            generate_load(url, args.rate, args.duration, args.connections, args.commission_path))
+    finally:
+        if server:
+            server.stop()
+
+    print_report(stats, elapsed, opened)
+    return not stats.errors
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,299 @@
+"""Cross-browser matrix: the F-Bank suites on Chrome and Firefox at once.
+
+Every (browser, test) pair is a job: the FBankAutotests tests, the
+TestFBank tests of the pytest suite, and a raw probe of each scenario's
+amounts. One longest-first JobQueue hands them to a fixed number of
+worker threads. Workers start spread over the browsers by remaining
+work; a worker keeps its headless browser for as long as jobs for that
+browser remain and only then switches. The merged report puts
+the browsers side by side and highlights tests whose outcome differs and
+amounts whose commission or validation differs.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import argparse
+import os
+import sys
+import time
+
+from Berezhnaya_SECOND import BASE_URL, TEST_METHODS, FBankAutotests
+from fbank_browser import LaunchProfile
+from fbank_scenarios import SCENARIOS, scenario_for
+from fbank_schedule import DurationHistory, JobQueue
+from fbank_smoke import print_smoke, run_smoke, target_usable
+from fbank_timing import StepTimer, write_json, write_junit
+
+
+BROWSERS = ["chrome", "firefox"]
+
+
+def pytest_tests():
+    from zhilkina_first_test import TestFBank
+
+    return sorted(name for name in dir(TestFBank) if name.startswith("test_"))
+
+
+def matrix_jobs(browsers):
+    """(browser, kind, name) for every suite test and scenario probe"""
+    jobs = []
+    for browser in browsers:
+        jobs += [(browser, "autotest", name) for name in TEST_METHODS]
+        jobs += [(browser, "pytest", name) for name in pytest_tests()]
+        jobs += [(browser, "probe", scenario.test_id) for scenario in SCENARIOS]
+    return jobs
+
+
+def job_key(job):
+    return ":".join(job)
+
+
+def record(job, passed, details="", **extra):
+    browser, kind, name = job
+    return dict({"browser": browser, "test": f"{browser}:{name}", "test_id": name, "name": f"{kind} [{browser}]",
+                 "passed": passed, "details": details}, **extra)
+
+
+def run_autotest(tester, job):
+    start = len(tester.records)
+    try:
+        tester.run_test(job[2])
+    except Exception as e:
+        return [record(job, False, f"Error: {e}")]
+    return [dict(item, browser=job[0], test=f"{job[0]}:{job[2]}", name=f"{item['name']} [{job[0]}]")
+            for item in tester.records[start:]]
+
+
+def run_pytest(tester, job):
+    from zhilkina_first_test import DriverPool, TestFBank
+
+    # The pytest fixture's reset between tests: fresh page, no cookies or storage
+    pool = DriverPool(tester.base_url, profile=tester.profile)
+    pool.driver = tester.driver
+    pool.reset()
+
+    case = TestFBank()
+    case.driver = tester.driver
+    case.base_url = tester.base_url
+    case.timeouts = tester.timeouts
+    case.timer = tester.timer
+    try:
+        getattr(case, job[2])()
+    except AssertionError as e:
+        return [record(job, False, f"Assertion failed: {e}")]
+    except Exception as e:
+        return [record(job, False, f"Error: {e}")]
+    return [record(job, True)]
+
+
+def run_probe(tester, job):
+    """Raw commission, availability and error text per amount of a scenario"""
+    scenario = scenario_for(job[2])
+    parsed = urlparse(tester.base_url)
+    tester.driver.get(f"{parsed.scheme}://{parsed.netloc}/{scenario.query()}")
+    if not tester.open_transfer_form() or not tester.enter_card_number(scenario.card_number):
+        return [record(job, False, "Failed to open transfer form")]
+
+    amounts = [amount for amount, _, _ in scenario.probes]
+    results = tester.probe_amounts(amounts)
+    if results is None:
+        return [record(job, False, "Failed to enter amount")]
+
+    mismatches = scenario.check(results)
+    probes = {amount: {"commission": result["commission"],
+                       "possible": result["transfer_possible"] and result["error_text"] is None,
+                       "error": result["error_text"]}
+              for amount, result in zip(amounts, results)}
+    return [record(job, not mismatches, "; ".join(mismatches), probes=probes)]
+
+
+JOB_RUNNERS = {"autotest": run_autotest, "pytest": run_pytest, "probe": run_probe}
+
+
+def run_job(tester, job):
+    if job[1] == "autotest":
+        # run_test times the test itself
+        return run_autotest(tester, job)
+
+    tester.timer.current_test = job[2]
+    try:
+        with tester.timer.step("test"):
+            return JOB_RUNNERS[job[1]](tester, job)
+    finally:
+        tester.timer.current_test = None
+
+
+def merge_events(timer, tester):
+    """Add a worker's events to the matrix timer, with tests named browser:test as in the records"""
+    browser = tester.profile.browser
+    for event in tester.timer.events:
+        timer.events.append(dict(event, test=f"{browser}:{event['test']}" if event["test"] else None))
+
+
+def matrix_worker(jobs, url, profiles, outcomes, history, timer):
+    """Pull jobs until none are left, reusing one browser while its jobs last"""
+    tester = None
+    browser = None
+    fresh = False
+    try:
+        while True:
+            job = jobs.next(browser)
+            if job is None:
+                return
+            if job[0] != browser:
+                if tester:
+                    tester.teardown()
+                    merge_events(timer, tester)
+                browser = job[0]
+                tester = FBankAutotests(url, profiles[browser])
+                if not tester.setup():
+                    # Do not keep relaunching a browser that cannot start
+                    for dropped in [job] + jobs.discard(browser):
+                        outcomes[dropped] = [record(dropped, False, "Browser startup error")]
+                    tester = browser = None
+                    continue
+                fresh = True
+
+            # FBankAutotests tests expect a freshly loaded main page, as right after setup
+            if not fresh:
+                tester.navigate_to_main_page()
+            tester.checkpoint = None
+            fresh = False
+
+            start = time.perf_counter()
+            outcomes[job] = run_job(tester, job)
+            history.record(job_key(job), time.perf_counter() - start)
+    finally:
+        if tester:
+            tester.teardown()
+            merge_events(timer, tester)
+
+
+def summarize(records):
+    if not records:
+        return "MISSING", "no result"
+    failed = [item for item in records if not item["passed"]]
+    if not failed:
+        return "PASSED", ""
+    return "FAILED", "; ".join(f"{item['test_id']}: {item['details']}" for item in failed)
+
+
+def probe_differences(by_browser):
+    """Amounts whose commission, availability or error text is not the same in every browser"""
+    probes = {browser: records[0].get("probes", {}) for browser, records in by_browser.items() if records}
+    amounts = sorted({amount for values in probes.values() for amount in values}, key=lambda a: int(a))
+    differences = []
+    for amount in amounts:
+        values = {browser: values.get(amount) for browser, values in probes.items()}
+        if len({repr(value) for value in values.values()}) > 1:
+            differences.append((amount, values))
+    return differences
+
+
+def print_matrix(outcomes, browsers, jobs):
+    print("\n" + "=" * 70)
+    print("CROSS-BROWSER MATRIX")
+    print("=" * 70)
+
+    rows = {}
+    for (browser, kind, name), records in outcomes.items():
+        rows.setdefault((kind, name), {})[browser] = records
+    order = list(dict.fromkeys((kind, name) for _, kind, name in jobs))
+
+    print(f"{'test':<50}" + "".join(f"{browser:<10}" for browser in browsers))
+    differing = []
+    for kind, name in order:
+        by_browser = rows.get((kind, name), {})
+        cells = {browser: summarize(by_browser.get(browser, [])) for browser in browsers}
+        differs = len(set(cells.values())) > 1
+        if kind == "probe":
+            differs = differs or bool(probe_differences(by_browser))
+        if differs:
+            differing.append((kind, name, cells, by_browser))
+        print(f"{kind + ' ' + name:<50}" + "".join(f"{cells[browser][0]:<10}" for browser in browsers)
+              + ("<< differs" if differs else ""))
+
+    if not differing:
+        print("\nNo browser-specific differences")
+        return []
+
+    print("\nBrowser-specific differences:")
+    for kind, name, cells, by_browser in differing:
+        print(f"- {kind} {name}")
+        for browser in browsers:
+            status, details = cells[browser]
+            print(f"    {browser}: {status}" + (f" | {details}" if details else ""))
+        if kind == "probe":
+            for amount, values in probe_differences(by_browser):
+                print(f"    amount {amount}: " + " | ".join(
+                    f"{browser} commission {value['commission']}, "
+                    f"{'possible' if value['possible'] else 'blocked'}"
+                    + (f", error {value['error']!r}" if value["error"] else "")
+                    if value else f"{browser} no value" for browser, value in values.items()))
+    return differing
+
+
+def run_matrix(url, browsers, workers, profile):
+    _, checks, seconds = run_smoke(url)
+    print_smoke(checks, seconds)
+    if not target_usable(checks):
+        print("Target is not reachable or has no #root, skipping the browser matrix")
+        return False, [], StepTimer()
+
+    # Both browsers at the same time only stays affordable headless
+    profiles = {browser: profile.with_browser(browser, headless=True) for browser in browsers}
+    jobs = matrix_jobs(browsers)
+    history = DurationHistory()
+    queue = JobQueue(jobs, history, key=job_key, group=lambda job: job[0])
+    workers = max(1, min(workers, len(jobs)))
+    print(f"Running {len(jobs)} jobs for {', '.join(browsers)} on {workers} workers")
+
+    outcomes = {}
+    timer = StepTimer()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(matrix_worker, queue, url, profiles, outcomes, history, timer)
+                   for _ in range(workers)]
+        for future in futures:
+            future.result()
+    history.save()
+
+    differing = print_matrix(outcomes, browsers, jobs)
+    records = [item for job in jobs for item in outcomes.get(job, [])]
+    passed = sum(1 for item in records if item["passed"])
+    print(f"\nTotal: {passed}/{len(records)} checks passed, {len(differing)} browser-specific differences")
+    return passed == len(records), records, timer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the F-Bank suites on several browsers at once")
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--local", action="store_true", help="run against a local stand-in server")
+    parser.add_argument("--browsers", default=",".join(BROWSERS), help="comma-separated: chrome,firefox")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent browsers across the matrix")
+    parser.add_argument("--report-json", metavar="PATH")
+    parser.add_argument("--report-junit", metavar="PATH")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if args.local:
+        from fbank_server import StandInServer
+
+        server = StandInServer(bundle_dir=os.environ.get("FBANK_BUNDLE_DIR")).start()
+        url = server.page_url()
+
+    try:
+        browsers = [browser for browser in args.browsers.split(",") if browser]
+        success, records, timer = run_matrix(url, browsers, args.workers, LaunchProfile.from_env())
+    finally:
+        if server:
+            server.stop()
+
+    if args.report_json:
+        write_json(args.report_json, records, timer)
+    if args.report_junit:
+        write_junit(args.report_junit, records, timer)
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
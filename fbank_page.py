@@ -0,0 +1,276 @@
+"""In-page commands for the F-Bank transfer form.
+
+One execute_async_script call sets any number of amounts the way React
+sees them, lets the app re-render after each one and reads back the
+commission, the transfer button state and any error text. Waits run
+inside the page on a MutationObserver, so they resolve as soon as the DOM
+reaches the target state instead of on WebDriverWait's 0.5 s polling.
+"""
+from fbank_selectors import DOM_HELPERS
+
+
+ERROR_WORDS = ["недостаточно", "insufficient"]
+
+WAIT_HELPERS = """
+// MessageChannel turns are not clamped to 4 ms like nested setTimeout calls,
+// which matters when thousands of amounts go through one script
+const channel = new MessageChannel();
+
+function nextTask() {
+    return new Promise(resolve => {
+        channel.port1.onmessage = () => resolve();
+        channel.port2.postMessage(null);
+    });
+}
+
+const OBSERVED = {subtree: true, childList: true, characterData: true, attributes: true};
+
+const HIDDEN_TEXT_PARENTS = ['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE'];
+
+// Only rendered text: script sources and hidden elements can contain the words too
+function isRenderedText(node) {
+    const parent = node.parentElement;
+    if (!parent || HIDDEN_TEXT_PARENTS.includes(parent.tagName)) return NodeFilter.FILTER_REJECT;
+    return isVisible(parent) ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_REJECT;
+}
+
+function findText(words) {
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, {acceptNode: isRenderedText});
+    while (walker.nextNode()) {
+        const text = walker.currentNode.nodeValue.trim();
+        const lower = text.toLowerCase();
+        if (words.some(word => lower.includes(word))) return text;
+    }
+    return null;
+}
+
+// Resolves with check()'s first truthy result, re-evaluated on every DOM
+// mutation and input event, or with null once timeoutMs has passed
+function waitFor(check, timeoutMs) {
+    return new Promise(resolve => {
+        let finished = false;
+        const onChange = () => {
+            const result = check();
+            if (result) finish(result);
+        };
+        const observer = new MutationObserver(onChange);
+        const timer = setTimeout(() => finish(null), timeoutMs);
+        function finish(value) {
+            if (finished) return;
+            finished = true;
+            observer.disconnect();
+            document.removeEventListener('input', onChange, true);
+            clearTimeout(timer);
+            resolve(value);
+        }
+        observer.observe(document.documentElement, OBSERVED);
+        // Property changes such as input.value do not mutate the DOM
+        document.addEventListener('input', onChange, true);
+        onChange();
+    });
+}
+
+// Start before triggering a change; resolves after the first task turn with
+// no DOM mutations, i.e. once the app has finished re-rendering
+function settle(maxMs) {
+    return new Promise(resolve => {
+        let dirty = false;
+        const observer = new MutationObserver(() => { dirty = true; });
+        const deadline = performance.now() + maxMs;
+        const tick = () => {
+            if (!dirty || performance.now() > deadline) {
+                observer.disconnect();
+                resolve();
+                return;
+            }
+            dirty = false;
+            nextTask().then(tick);
+        };
+        observer.observe(document.documentElement, OBSERVED);
+        // Mutations from the change itself are delivered before this turn ends
+        dirty = true;
+        nextTask().then(tick);
+    });
+}
+
+function makeCheck(condition) {
+    switch (condition.kind) {
+    case 'value':
+        return () => {
+            const value = condition.element.value;
+            const matches = condition.value === null ? value !== '' : value === condition.value;
+            return matches ? {value: value} : null;
+        };
+    case 'text':
+        return () => {
+            const text = findText(condition.words);
+            return text === null ? null : {text: text};
+        };
+    case 'text_changed':
+        return () => {
+            const match = pickFirst(condition.selectors, 'present', null);
+            const text = match ? match[1].innerText : null;
+            return text !== condition.previous ? {text: text} : null;
+        };
+    case 'clickable':
+        return () => {
+            const clickable = pickFirst(condition.selectors, 'clickable', null) !== null;
+            return clickable === condition.state ? {clickable: clickable} : null;
+        };
+    }
+    throw new Error('Unknown wait condition: ' + condition.kind);
+}
+"""
+
+WAIT_SCRIPT = DOM_HELPERS + WAIT_HELPERS + """
+const [condition, timeoutMs, settleMs] = arguments;
+const done = arguments[arguments.length - 1];
+
+(async () => {
+    const result = await waitFor(makeCheck(condition), timeoutMs);
+    if (result && settleMs) {
+        await settle(settleMs);
+    }
+    done(result);
+})().catch(e => done({error: String(e)}));
+"""
+
+FORM_HELPERS = """
+// React tracks the last value it rendered; the native setter bypasses that
+// tracker so the dispatched input event is treated as a real edit
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+
+function setInputValue(input, value) {
+    setValue.call(input, value);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    input.dispatchEvent(new Event('change', {bubbles: true}));
+}
+
+function readState(input, selectors, errorWords) {
+    const commission = pickFirst(selectors.commission, 'present', /\\d/);
+    const digits = commission ? commission[1].innerText.match(/\\d+/) : null;
+    return {
+        value: input.value,
+        commission: digits ? parseInt(digits[0], 10) : 0,
+        transfer_possible: pickFirst(selectors.button, 'clickable', null) !== null,
+        error_text: findText(errorWords)
+    };
+}
+"""
+
+PROBE_SCRIPT = DOM_HELPERS + WAIT_HELPERS + FORM_HELPERS + """
+const [amounts, selectors, errorWords] = arguments;
+const done = arguments[arguments.length - 1];
+
+(async () => {
+    const field = pickFirst(selectors.amount, 'present', null);
+    if (!field) {
+        done(null);
+        return;
+    }
+    const input = field[1];
+    const results = [];
+    for (const amount of amounts) {
+        const rendered = settle(2000);
+        setInputValue(input, amount);
+        await rendered;
+        results.push(Object.assign({amount: amount}, readState(input, selectors, errorWords)));
+    }
+    done(results);
+})().catch(e => done({error: String(e)}));
+"""
+
+SNAPSHOT_SCRIPT = DOM_HELPERS + WAIT_HELPERS + FORM_HELPERS + """
+const [selectors, errorWords, amount] = arguments;
+const done = arguments[arguments.length - 1];
+
+(async () => {
+    const field = pickFirst(selectors.amount, 'present', null);
+    if (!field) {
+        done(null);
+        return;
+    }
+    const input = field[1];
+    if (amount !== null) {
+        const rendered = settle(2000);
+        setInputValue(input, amount);
+        await rendered;
+    }
+    const card = pickFirst(selectors.card, 'present', null);
+    done(Object.assign({url: location.href, card: card ? card[1].value : null},
+                       readState(input, selectors, errorWords)));
+})().catch(e => done({error: String(e)}));
+"""
+
+OPEN_FORM_SCRIPT = DOM_HELPERS + WAIT_HELPERS + FORM_HELPERS + """
+const [selectors, cardNumber, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+
+// Resolves with null once the form is open and the card entered,
+// otherwise with the name of the step that did not complete
+(async () => {
+    const account = await waitFor(() => pickFirst(selectors.account, 'clickable', null), timeoutMs);
+    if (!account) {
+        done('account');
+        return;
+    }
+    account[1].click();
+
+    const card = await waitFor(() => pickFirst(selectors.card, 'present', null), timeoutMs);
+    if (!card) {
+        done('card');
+        return;
+    }
+    const rendered = settle(2000);
+    setInputValue(card[1], cardNumber);
+    await rendered;
+    done(null);
+})().catch(e => done(String(e)));
+"""
+
+
+def probe_amounts(driver, amounts, selectors, timeout=None):
+    """Enter each amount in turn and return one result dict per amount.
+
+    selectors maps "amount", "commission" and "button" to candidate lists.
+    Returns None when the amount field is not on the page.
+    """
+    amounts = [str(amount) for amount in amounts]
+    if timeout is None:
+        timeout = 10 + 0.05 * len(amounts)
+    driver.set_script_timeout(timeout)
+
+    results = driver.execute_async_script(PROBE_SCRIPT, amounts, selectors, ERROR_WORDS)
+    if isinstance(results, dict):
+        raise RuntimeError(f"In-page probe failed: {results['error']}")
+    return results
+
+
+def snapshot_form(driver, selectors, amount=None, timeout=10):
+    """State of the transfer form (URL, card, amount, commission, button, error).
+
+    With amount set, the amount field is first reset to that value the way
+    React sees it. Returns None when the amount field is not on the page.
+    """
+    driver.set_script_timeout(timeout)
+    state = driver.execute_async_script(SNAPSHOT_SCRIPT, selectors, ERROR_WORDS, amount)
+    if state and "error" in state:
+        raise RuntimeError(f"In-page snapshot failed: {state['error']}")
+    return state
+
+
+def wait_for(driver, condition, timeout=10, settle=0):
+    """Wait in-page until condition holds; returns its result dict or None on timeout.
+
+    condition is one of:
+      {"kind": "value", "element": <input>, "value": "100" or None for any non-empty value}
+      {"kind": "text", "words": [...]}
+      {"kind": "text_changed", "selectors": [...], "previous": "<text>"}
+      {"kind": "clickable", "selectors": [...], "state": True/False}
+    With settle > 0 it also waits (up to that many seconds) for the re-render to finish.
+    """
+    driver.set_script_timeout(timeout + settle + 5)
+    result = driver.execute_async_script(WAIT_SCRIPT, condition, timeout * 1000, settle * 1000)
+    if result and "error" in result:
+        raise RuntimeError(f"In-page wait failed: {result['error']}")
+    return result
@@ -0,0 +1,127 @@
+"""The FBT test cases as data, compiled from the manual test case markdown.
+
+Berezhnaya_SECOND.md is the source of truth for IDs, account state, card
+number, probed amounts and expected commissions/availability; the
+runners replay the compiled scenarios instead of copying those values.
+Each probe is (amount, expected commission, expected transfer
+possibility); None means the value is not checked.
+"""
+import json
+import os
+import re
+
+
+CASES_MARKDOWN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Berezhnaya_SECOND.md")
+
+CASE_ID = re.compile(r"\*\*ID:\*\*\s*`([^`]+)`")
+CASE_TITLE = re.compile(r"\*\*Название:\*\*\s*(.+?)\s*$", re.MULTILINE)
+ACCOUNT_STATE = re.compile(r"\?balance=(\d+)&reserved=(\d+)")
+CARD_NUMBER = re.compile(r"номер карты:\s*`(\d+)`")
+STEP_AMOUNT = re.compile(r"сумму перевода:\s*`(-?\d+)\s*₽`")
+# "Для суммы 1000 ₽ комиссия = 100 ₽", "Сумма 104 ₽: комиссия 10 ₽"
+AMOUNT_COMMISSION = re.compile(r"[Сс]умм\w*\s+(-?\d+)\s*₽:?\s+комиссия\s*=?\s*(\d+)\s*₽")
+# "Комиссия 10% от 9999 = 999.9 → округление вниз до 999 ₽"
+PERCENT_COMMISSION = re.compile(r"[Кк]омиссия\s+\d+%\s+от\s+(-?\d+)\s*=.*\D(\d+)\s*₽")
+# "Сумма 1 ₽ должна приниматься с комиссией 0 ₽"
+ACCEPTED_WITH_COMMISSION = re.compile(r"[Сс]умм\w*\s+(-?\d+)\s*₽\s+должна приниматься\s+с комиссией\s+(\d+)\s*₽")
+ACCEPTED = re.compile(r"[Сс]умм\w*\s+(-?\d+)\s*₽\s+должна приниматься")
+REJECTED = re.compile(r"[Сс]умм\w*\s+(-?\d+)\s*₽\s+должна отклоняться")
+
+
+class Scenario:
+    def __init__(self, test_id, title, probes, balance=30000, reserved=20001, card_number="1111222233334444"):
+        self.test_id = test_id
+        self.title = title
+        self.probes = list(probes)
+        self.balance = balance
+        self.reserved = reserved
+        self.card_number = card_number
+
+    def __repr__(self):
+        return f"Scenario({self.test_id!r}, balance={self.balance}, reserved={self.reserved}, probes={self.probes!r})"
+
+    def fingerprint(self):
+        """Stable JSON of everything that defines the case"""
+        return json.dumps([self.test_id, self.title, self.balance, self.reserved, self.card_number,
+                           self.probes], ensure_ascii=False)
+
+    def query(self):
+        return f"?balance={self.balance}&reserved={self.reserved}"
+
+    def check(self, results):
+        """Mismatch descriptions for probe results as returned by fbank_page.probe_amounts"""
+        mismatches = []
+        for (amount, commission, possible), result in zip(self.probes, results):
+            if commission is not None and result["commission"] != commission:
+                mismatches.append(f"{amount}: commission {result['commission']} (expected: {commission})")
+
+            actual_possible = result["transfer_possible"] and result["error_text"] is None
+            if possible is not None and actual_possible != possible:
+                mismatches.append(f"{amount}: transfer {'possible' if actual_possible else 'blocked'} "
+                                  f"(expected: {'possible' if possible else 'blocked'})")
+        return mismatches
+
+
+def section(text, start, end):
+    """Text between two bold headings such as **Ожидаемый результат:**"""
+    match = re.search(re.escape(start) + r"(.*?)" + re.escape(end), text, re.DOTALL)
+    return match.group(1) if match else ""
+
+
+def compile_case(text, defaults):
+    """Scenario for one "## Тест-кейс" section; defaults carry account state and card forward"""
+    test_id = CASE_ID.search(text).group(1)
+    title = CASE_TITLE.search(text).group(1)
+
+    state = ACCOUNT_STATE.search(text)
+    if state:
+        defaults["balance"], defaults["reserved"] = int(state.group(1)), int(state.group(2))
+    card = CARD_NUMBER.search(text)
+    if card:
+        defaults["card_number"] = card.group(1)
+
+    expected = section(text, "**Ожидаемый результат:**", "**Фактический результат:**")
+    commissions, possible = {}, {}
+    for pattern in (AMOUNT_COMMISSION, PERCENT_COMMISSION):
+        for amount, commission in pattern.findall(expected):
+            commissions[amount] = int(commission)
+    for amount, commission in ACCEPTED_WITH_COMMISSION.findall(expected):
+        commissions[amount] = int(commission)
+    for amount in ACCEPTED.findall(expected):
+        possible[amount] = True
+    for amount in REJECTED.findall(expected):
+        possible[amount] = False
+
+    amounts = STEP_AMOUNT.findall(text)
+    # "Суммы 0 ₽ и отрицательные суммы не должны приниматься"
+    for line in expected.splitlines():
+        if "не должны приниматься" in line:
+            for amount in amounts:
+                if f"{amount} ₽" in line or (amount.startswith("-") and "отрицательн" in line):
+                    possible[amount] = False
+
+    probes = [(amount, commissions.get(amount), possible.get(amount)) for amount in amounts]
+    return Scenario(test_id, title, probes, **defaults)
+
+
+def compile_markdown(path=CASES_MARKDOWN):
+    """All test cases of a manual test case file, in document order"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    defaults = {}
+    scenarios = []
+    for case in re.split(r"^## Тест-кейс", text, flags=re.MULTILINE)[1:]:
+        if CASE_ID.search(case):
+            scenarios.append(compile_case(case, defaults))
+    return scenarios
+
+
+def scenario_for(test_id, scenarios=None):
+    for scenario in SCENARIOS if scenarios is None else scenarios:
+        if scenario.test_id == test_id:
+            return scenario
+    raise KeyError(test_id)
+
+
+SCENARIOS = compile_markdown()
@@ -0,0 +1,118 @@
+import os
+
+import numpy as np
+
+from fbank_grid import max_affordable
+from fbank_scenarios import SCENARIOS, compile_markdown, scenario_for
+from fbank_sweep import group_ranges, reference
+from fbank_verdicts import balance_texts, probed_amounts, validation_boundary_values
+
+
+class TestScenarios:
+    def test_compiled_ids(self):
+        assert [scenario.test_id for scenario in SCENARIOS] == ["FBT-006", "FBT-007", "FBT-008", "FBT-009", "FBT-010"]
+
+    def test_account_state(self):
+        for scenario in SCENARIOS:
+            assert (scenario.balance, scenario.reserved) == (30000, 20001)
+            assert scenario.card_number == "1111222233334444"
+            assert scenario.query() == "?balance=30000&reserved=20001"
+
+    def test_fbt_006_probes(self):
+        assert scenario_for("FBT-006").probes == [("9999", 999, None)]
+
+    def test_fbt_007_probes(self):
+        assert scenario_for("FBT-007").probes == [("9098", None, True), ("9099", None, False), ("9097", None, True)]
+
+    def test_fbt_008_probes(self):
+        assert scenario_for("FBT-008").probes == [("1000", 100, None), ("5000", 500, None), ("155", 15, None),
+                                                  ("199", 19, None), ("100", 10, None)]
+
+    def test_fbt_009_probes(self):
+        assert scenario_for("FBT-009").probes == [("104", 10, None), ("105", 10, None), ("109", 10, None),
+                                                  ("110", 11, None), ("149", 14, None)]
+
+    def test_fbt_010_probes(self):
+        assert scenario_for("FBT-010").probes == [("0", None, False), ("-100", None, False), ("1", 0, True),
+                                                  ("9098", None, True)]
+
+    def test_ui_cases_have_no_probes(self):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ZHILKINA_FIRST.md")
+        scenarios = compile_markdown(path)
+        assert [scenario.test_id for scenario in scenarios] == ["FBT-001", "FBT-002", "FBT-003", "FBT-004", "FBT-005"]
+        assert all(scenario.probes == [] for scenario in scenarios)
+
+    def test_check_reports_mismatches(self):
+        scenario = scenario_for("FBT-007")
+        results = [{"commission": 909, "transfer_possible": True, "error_text": None},
+                   {"commission": 909, "transfer_possible": True, "error_text": "Недостаточно средств"},
+                   {"commission": 909, "transfer_possible": False, "error_text": None}]
+        assert scenario.check(results) == ["9097: transfer blocked (expected: possible)"]
+
+
+def probe(amount, commission=0, possible=False, error=None, value=None):
+    return {"amount": amount, "value": amount if value is None else value, "commission": commission,
+            "transfer_possible": possible, "error_text": error}
+
+
+class TestVerdicts:
+    def test_amounts_come_from_the_scenarios(self):
+        assert probed_amounts("FBT-007") == ["9098", "9099", "9097"]
+        assert probed_amounts("FBT-010") == ["0", "-100", "1", "9098"]
+
+    def test_balance_texts(self):
+        assert balance_texts("FBT-006") == ["30'000", "20'001"]
+
+    def test_validation_passes(self):
+        probes = [probe("0"), probe("-100", value=""), probe("1", possible=True), probe("9098", 909, True)]
+        assert validation_boundary_values(probes) == ("Amount validation", True, "Amount validation works correctly")
+
+    def test_validation_runs_every_compiled_probe(self):
+        probes = [probe("0", possible=True), probe("-100"), probe("1", 1, True), probe("9098", error="Недостаточно")]
+        step, passed, details = validation_boundary_values(probes)
+        assert not passed
+        assert details == ("Validation issues: System accepts zero amount, System accepts negative amount, "
+                           "Commission for 1 is 1 instead of 0, System rejects amount 9098")
+
+
+class TestReference:
+    def test_commission_rounds_down(self):
+        commission, _ = reference([0, 9, 10, 19, 104, 109, 110, 9999], 30000, 20001)
+        assert commission.tolist() == [0, 0, 1, 1, 10, 10, 11, 999]
+
+    def test_availability_boundary(self):
+        _, possible = reference([-100, 0, 1, 9090, 9091], 30000, 20001)
+        assert possible.tolist() == [False, False, True, True, False]
+
+    def test_nothing_available(self):
+        _, possible = reference([1, 100], 100, 100)
+        assert not possible.any()
+
+
+class TestGroupRanges:
+    def test_empty(self):
+        assert group_ranges([]) == []
+
+    def test_single_value(self):
+        assert group_ranges([5]) == [(5, 5)]
+
+    def test_runs(self):
+        assert group_ranges(np.array([1, 2, 3, 7, 9, 10])) == [(1, 3), (7, 7), (9, 10)]
+
+
+class TestMaxAffordable:
+    def test_default_account(self):
+        assert max_affordable(30000, 20001) == 9090
+
+    def test_small_balance(self):
+        assert max_affordable(100, 50) == 46
+
+    def test_nothing_available(self):
+        assert max_affordable(100, 100) == 0
+        assert max_affordable(100, 200) == 0
+
+    def test_matches_reference(self):
+        for balance, reserved in [(30000, 20001), (100, 50), (11, 0), (1_000_000_000, 1)]:
+            amount = max_affordable(balance, reserved)
+            _, possible = reference([amount, amount + 1], balance, reserved)
+            assert possible.tolist() == [True, False]
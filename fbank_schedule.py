@@ -0,0 +1,129 @@
+"""Cost-based scheduling of tests over parallel browser workers.
+
+Every run records how long each test took; the next parallel run queues
+tests longest-first by their historical median. Workers pull from that
+queue whenever they become free, so one finishing early takes the next
+longest test instead of sitting idle (greedy LPT list scheduling, within
+4/3 of the optimal makespan). After the run the makespan is compared to
+the ideal: max(total work / workers, longest test).
+"""
+from statistics import median
+import heapq
+import os
+import threading
+
+from fbank_cache import CACHE_DIR, load_store, update_store
+
+
+DURATION_HISTORY = os.path.join(CACHE_DIR, "durations.json")
+# Estimate for tests that have never run and no other test to compare with
+DEFAULT_ESTIMATE = 10.0
+
+
+class DurationHistory:
+    def __init__(self, path=DURATION_HISTORY, max_samples=20):
+        self.path = path
+        self.max_samples = max_samples
+        self.durations = load_store(self.path)
+        self.added = {}
+
+    def save(self):
+        if not self.added:
+            return
+
+        def merge(durations):
+            # Only this run's samples: other processes may have saved theirs since we loaded
+            for job, samples in self.added.items():
+                durations[job] = (durations.get(job, []) + samples)[-self.max_samples:]
+            return durations
+
+        self.durations = update_store(self.path, merge)
+        self.added = {}
+
+    def record(self, job, seconds):
+        sample = round(seconds, 3)
+        samples = self.durations.setdefault(job, [])
+        samples.append(sample)
+        del samples[:-self.max_samples]
+        self.added.setdefault(job, []).append(sample)
+
+    def estimate(self, job):
+        """Median of past durations; unknown jobs get the mean of known ones"""
+        samples = self.durations.get(job)
+        if samples:
+            return median(samples)
+        known = [median(samples) for samples in self.durations.values() if samples]
+        return sum(known) / len(known) if known else DEFAULT_ESTIMATE
+
+
+def longest_first(jobs, history, key=str):
+    """Jobs ordered by estimated duration, longest first; ties keep their order.
+    key maps a job to its name in the history."""
+    return sorted(jobs, key=lambda job: history.estimate(key(job)), reverse=True)
+
+
+def list_schedule(durations, workers):
+    """Makespan of handing durations, in order, to whichever worker frees up first"""
+    finish = [0.0] * max(1, workers)
+    for duration in durations:
+        heapq.heapreplace(finish, finish[0] + duration)
+    return max(finish)
+
+
+def ideal_makespan(durations, workers):
+    """Lower bound no schedule can beat"""
+    if not durations:
+        return 0.0
+    return max(sum(durations) / max(1, workers), max(durations))
+
+
+def print_schedule_report(order, durations, workers, makespan):
+    """Compare the busiest worker's test time with the ideal and with suite order"""
+    ran = [durations[job] for job in order if job in durations]
+    ideal = ideal_makespan(ran, workers)
+    print("\nSchedule:")
+    print(f"- order: {', '.join(order)}")
+    print(f"- makespan {makespan:.2f}s on {workers} workers, ideal {ideal:.2f}s "
+          f"({makespan / ideal if ideal else 1:.2f}x)")
+    suite_order = [durations[job] for job in sorted(durations)]
+    print(f"- with this run's durations: planned order {list_schedule(ran, workers):.2f}s, "
+          f"suite order {list_schedule(suite_order, workers):.2f}s")
+
+
+class JobQueue:
+    """Longest-first job list shared by worker threads.
+
+    A worker asks for its next job with the group it is set up for (e.g. the
+    browser it has running) and gets the longest job of that group. A new
+    worker, or one whose group is drained, joins the group with the most
+    estimated work left per worker already on it.
+    """
+
+    def __init__(self, jobs, history, key=str, group=None):
+        self.jobs = [(job, history.estimate(key(job))) for job in longest_first(jobs, history, key)]
+        self.group = group or (lambda job: None)
+        self.workers = {}
+        self.lock = threading.Lock()
+
+    def next(self, group=None):
+        with self.lock:
+            if not self.jobs:
+                return None
+            remaining = {}
+            for job, estimate in self.jobs:
+                remaining[self.group(job)] = remaining.get(self.group(job), 0) + estimate
+            if group not in remaining:
+                if group in self.workers:
+                    self.workers[group] -= 1
+                group = max(remaining, key=lambda name: remaining[name] / (self.workers.get(name, 0) + 1))
+                self.workers[group] = self.workers.get(group, 0) + 1
+            for index, (job, _) in enumerate(self.jobs):
+                if self.group(job) == group:
+                    return self.jobs.pop(index)[0]
+
+    def discard(self, group):
+        """Remove and return every job of a group, e.g. when its browser cannot start"""
+        with self.lock:
+            dropped = [job for job, _ in self.jobs if self.group(job) == group]
+            self.jobs = [(job, estimate) for job, estimate in self.jobs if self.group(job) != group]
+            return dropped
@@ -0,0 +1,74 @@
+import pytest
+
+from fbank_schedule import DurationHistory, JobQueue, ideal_makespan, list_schedule
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = DurationHistory(path=str(tmp_path / "durations.json"))
+    for browser in ["chrome", "firefox"]:
+        history.record(f"{browser}:long", 5.0)
+        for name in ["a", "b", "c"]:
+            history.record(f"{browser}:{name}", 1.0)
+    history.record("chrome:long2", 5.0)
+    return history
+
+
+def matrix_queue(history):
+    jobs = [(browser, name) for browser in ["chrome", "firefox"] for name in ["a", "b", "c", "long"]]
+    # Chrome has more long work, so its jobs lead the longest-first order
+    jobs.insert(0, ("chrome", "long2"))
+    return JobQueue(jobs, history, key=":".join, group=lambda job: job[0])
+
+
+class TestJobQueue:
+    def test_longest_first_within_group(self, history):
+        queue = matrix_queue(history)
+        assert sorted(queue.next("chrome")[1] for _ in range(2)) == ["long", "long2"]
+        assert queue.next("chrome")[1] in "abc"
+
+    def test_starting_workers_spread_over_groups(self, history):
+        queue = matrix_queue(history)
+        first = [queue.next(None) for _ in range(2)]
+        assert sorted(job[0] for job in first) == ["chrome", "firefox"]
+        assert all(job[1].startswith("long") for job in first)
+
+    def test_drained_group_switches(self, history):
+        queue = matrix_queue(history)
+        chrome = [queue.next("chrome") for _ in range(5)]
+        assert all(job[0] == "chrome" for job in chrome)
+        assert queue.next("chrome") == ("firefox", "long")
+
+    def test_discard(self, history):
+        queue = matrix_queue(history)
+        dropped = queue.discard("firefox")
+        assert sorted(dropped) == [("firefox", "a"), ("firefox", "b"), ("firefox", "c"), ("firefox", "long")]
+        jobs = []
+        while (job := queue.next(None)) is not None:
+            jobs.append(job)
+        assert all(job[0] == "chrome" for job in jobs) and len(jobs) == 5
+
+
+class TestDurationHistory:
+    def test_unknown_job_gets_mean_of_known(self, history):
+        assert history.estimate("chrome:new") == pytest.approx(21 / 9)
+
+    def test_save_keeps_samples_of_other_instances(self, tmp_path):
+        path = str(tmp_path / "durations.json")
+        first, second = DurationHistory(path=path), DurationHistory(path=path)
+        second.record("b", 2.0)
+        second.save()
+        first.record("a", 1.0)
+        first.save()
+        assert DurationHistory(path=path).durations == {"a": [1.0], "b": [2.0]}
+
+
+class TestMakespan:
+    def test_list_schedule(self):
+        assert list_schedule([5, 3, 3, 2], 2) == 7
+        assert list_schedule([2, 3, 3, 5], 2) == 8
+
+    def test_ideal_makespan(self):
+        assert ideal_makespan([5, 3, 3, 2], 2) == 6.5
+        assert ideal_makespan([10, 1], 4) == 10
+        assert ideal_makespan([], 2) == 0.0
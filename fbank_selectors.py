@@ -0,0 +1,151 @@
+"""Selector resolution for the F-Bank autotests.
+
+Every candidate selector for a logical element is checked in a single
+in-page query, and the selector that won is remembered on disk so the
+next run tries it first.
+"""
+from contextlib import nullcontext
+import os
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from fbank_cache import CACHE_DIR, load_store, update_store
+
+
+SELECTOR_CACHE = os.path.join(CACHE_DIR, "selectors.json")
+
+# Candidates for the F-Bank form elements, shared by the Selenium and CDP runners
+TRANSFER_ACCOUNT_SELECTORS = [
+    "//*[contains(text(), 'Рубли')]",
+    "//*[contains(text(), 'RUB')]",
+    "//div[contains(@class, 'account')]",
+    "//button[contains(text(), 'Руб')]"
+]
+
+CARD_INPUT_SELECTORS = [
+    "input[placeholder*='0000']",
+    "input[placeholder*='card']",
+    "input[type='text']"
+]
+
+AMOUNT_INPUT_SELECTORS = [
+    "input[placeholder='1000']",
+    "input[placeholder*='1000']",
+    "input[type='number']"
+]
+
+COMMISSION_SELECTORS = [
+    "//*[contains(text(), 'Commission')]//following-sibling::*",
+    "//*[contains(text(), 'Комиссия')]//following-sibling::*",
+    "//*[contains(text(), 'commission')]",
+    ".commission",
+    "#commission"
+]
+
+TRANSFER_BUTTON_SELECTORS = [
+    "button.g-button",
+    "button[class*='g-button']",
+    "//button[contains(@class, 'g-button')]",
+    "//button[contains(text(), 'Transfer')]",
+    "//button[contains(text(), 'Перевести')]"
+]
+
+# JS helpers, also reused by the batched scripts in fbank_page
+DOM_HELPERS = """
+function firstMatch(selector) {
+    if (selector.startsWith('//') || selector.startsWith('(')) {
+        return document.evaluate(selector, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(selector);
+}
+
+function isVisible(el) {
+    const style = window.getComputedStyle(el);
+    return el.getClientRects().length > 0 && style.visibility !== 'hidden';
+}
+
+function pickFirst(candidates, condition, pattern) {
+    for (let i = 0; i < candidates.length; i++) {
+        let el;
+        try {
+            el = firstMatch(candidates[i]);
+        } catch (e) {
+            continue;
+        }
+        if (!el) continue;
+        if (condition === 'clickable' && !(isVisible(el) && !el.disabled)) continue;
+        if (pattern && !pattern.test(el.innerText || '')) continue;
+        return [i, el];
+    }
+    return null;
+}
+"""
+
+RACE_SCRIPT = DOM_HELPERS + """
+const [candidates, condition, textPattern] = arguments;
+return pickFirst(candidates, condition, textPattern ? new RegExp(textPattern) : null);
+"""
+
+
+class SelectorResolver:
+    def __init__(self, driver, cache_path=SELECTOR_CACHE, timer=None, timeouts=None):
+        self.driver = driver
+        self.cache_path = cache_path
+        self.timer = timer
+        self.timeouts = timeouts
+        self.winners = load_store(self.cache_path)
+
+    def save(self):
+        update_store(self.cache_path, lambda winners: dict(winners, **self.winners), indent=2, ensure_ascii=False)
+
+    def remember(self, name, selector):
+        if self.winners.get(name) != selector:
+            self.winners[name] = selector
+            self.save()
+
+    def ordered(self, name, selectors):
+        """Candidates with the previously winning selector moved to the front"""
+        winner = self.winners.get(name)
+        if winner in selectors:
+            return [winner] + [s for s in selectors if s != winner]
+        return list(selectors)
+
+    def race(self, name, selectors, condition="present", text_pattern=None):
+        """Return the first candidate that matches right now, or None"""
+        candidates = self.ordered(name, selectors)
+        with self.timer.step("selector", element=name) if self.timer else nullcontext({}) as event:
+            match = self.driver.execute_script(RACE_SCRIPT, candidates, condition, text_pattern)
+            event["ok"] = bool(match)
+            if not match:
+                return None
+
+            index, element = match
+            event["selector"] = candidates[index]
+            self.remember(name, candidates[index])
+            return element
+
+    def find(self, name, selectors, condition="present", text_pattern=None, timeout=None):
+        """Wait until any candidate matches; one timeout covers the whole list.
+
+        Without an explicit timeout it comes from the TimeoutManager (10 s if none).
+        """
+        key = f"selector:{name}"
+        if timeout is None:
+            timeout = self.timeouts.timeout_for(key) if self.timeouts else 10
+
+        start = time.perf_counter()
+        try:
+            element = WebDriverWait(self.driver, timeout).until(
+                lambda driver: self.race(name, selectors, condition, text_pattern)
+            )
+        except TimeoutException:
+            if self.timeouts:
+                self.timeouts.observe(key, time.perf_counter() - start, timed_out=True)
+            return None
+
+        if self.timeouts:
+            self.timeouts.observe(key, time.perf_counter() - start)
+        return element
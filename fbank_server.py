@@ -0,0 +1,177 @@
+"""Local F-Bank server for hermetic autotest runs.
+
+Serves either a built F-Bank bundle directory or a minimal stand-in page
+with the same DOM contract the suites rely on: the Рубли account block
+with balance and reserve, the card and amount inputs, the commission text,
+the g-button transfer button and the insufficient-funds message. It binds
+an ephemeral port on the loopback interface and needs no network access.
+"""
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode, urlparse
+import os
+import threading
+
+
+STAND_IN_PAGE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>F-Bank</title>
+<style>
+  .account { cursor: pointer; padding: 8px; border: 1px solid #ccc; }
+  .account.selected { border-color: #333; }
+  .error { color: #c00; }
+</style>
+<script src="/app.js" defer></script>
+</head>
+<body>
+<div id="root">
+  <header>
+    <h1>F-Bank</h1>
+    <button type="button">История операций</button>
+    <button type="button">Настройки</button>
+  </header>
+  <main>
+    <div class="account" id="rub-account">
+      <div>Рубли</div>
+      <div>На счету: <span id="balance"></span></div>
+      <div>Резерв: <span id="reserved"></span></div>
+    </div>
+    <form id="transfer" onsubmit="return false">
+      <input type="text" id="card" placeholder="0000 0000 0000 0000">
+      <input type="text" id="amount" placeholder="1000" inputmode="numeric">
+      <div class="commission-row"><span>Комиссия</span><span class="commission" id="commission">0 ₽</span></div>
+      <div class="error" id="error"></div>
+      <button type="submit" class="g-button" id="transfer-button" disabled>Перевести</button>
+    </form>
+  </main>
+  <footer>F-Bank stand-in</footer>
+</div>
+</body>
+</html>
+"""
+
+# Served as /app.js so the page's text content holds only rendered text
+STAND_IN_SCRIPT = """(function () {
+  const params = new URLSearchParams(location.search);
+  const balance = parseInt(params.get('balance') || '__BALANCE__', 10);
+  const reserved = parseInt(params.get('reserved') || '__RESERVED__', 10);
+  const format = n => String(n).replace(/\\B(?=(\\d{3})+(?!\\d))/g, "'");
+
+  document.getElementById('balance').textContent = format(balance) + ' ₽';
+  document.getElementById('reserved').textContent = format(reserved) + ' ₽';
+
+  const account = document.getElementById('rub-account');
+  account.addEventListener('click', () => account.classList.add('selected'));
+
+  const amountInput = document.getElementById('amount');
+  amountInput.addEventListener('input', () => {
+    const digits = amountInput.value.replace(/\\D/g, '');
+    if (digits !== amountInput.value) amountInput.value = digits;
+
+    const amount = parseInt(digits || '0', 10);
+    const commission = Math.floor(amount / 10);
+    const insufficient = amount + commission > balance - reserved;
+
+    document.getElementById('commission').textContent = commission + ' ₽';
+    document.getElementById('error').textContent = insufficient ? 'Недостаточно средств' : '';
+    document.getElementById('transfer-button').disabled = amount <= 0 || insufficient;
+  });
+})();
+"""
+
+
+class StandInServer:
+    """Background HTTP server on an ephemeral port; usable as a context manager"""
+
+    def __init__(self, balance=30000, reserved=20001, bundle_dir=None, host="127.0.0.1", port=0):
+        self.balance = balance
+        self.reserved = reserved
+        self.bundle_dir = bundle_dir
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def url(self):
+        # "localhost" rather than the bound address: the suites check for it in current_url
+        return f"http://localhost:{self.port}"
+
+    def page_url(self, balance=None, reserved=None):
+        query = urlencode({
+            "balance": self.balance if balance is None else balance,
+            "reserved": self.reserved if reserved is None else reserved,
+        })
+        return f"{self.url}/?{query}"
+
+    def start(self):
+        self.httpd = ThreadingHTTPServer((self.host, self.port), self.make_handler())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def make_handler(self):
+        page = STAND_IN_PAGE.encode("utf-8")
+        script = (STAND_IN_SCRIPT
+                  .replace("__BALANCE__", str(self.balance))
+                  .replace("__RESERVED__", str(self.reserved))
+                  .encode("utf-8"))
+        bundle_dir = self.bundle_dir
+
+        class Handler(SimpleHTTPRequestHandler):
+            # Keep-alive, so load tests can reuse connections; every response sets Content-Length
+            protocol_version = "HTTP/1.1"
+            # Otherwise Nagle holds back small responses until the client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=bundle_dir or os.getcwd(), **kwargs)
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if bundle_dir is None:
+                    if path in ("/", "/index.html"):
+                        self.send_body(page, "text/html; charset=utf-8")
+                    elif path == "/app.js":
+                        self.send_body(script, "text/javascript; charset=utf-8")
+                    else:
+                        self.send_error(404)
+                    return
+
+                # Single-page app: unknown routes fall back to index.html
+                if not os.path.exists(os.path.join(bundle_dir, path.lstrip("/"))):
+                    self.path = "/index.html"
+                super().do_GET()
+
+            def do_HEAD(self):
+                if bundle_dir is None:
+                    self.send_error(405)
+                    return
+                super().do_HEAD()
+
+            def send_body(self, body, content_type):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
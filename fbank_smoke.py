@@ -0,0 +1,158 @@
+"""Browserless smoke tier for the F-Bank suites.
+
+The static checks of test_1/test_2/test_5 (title contains "F-Bank",
+#root exists and has content, header/main/footer present, the page
+loads) are answered from the HTML and the same-origin bundle fetched
+over HTTP, in milliseconds. When #root is empty because the app renders
+client-side, the bundle is searched for the element names instead. The
+browser tiers run only after these checks pass.
+"""
+from html.parser import HTMLParser
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin
+from urllib.request import urlopen
+import argparse
+import re
+import sys
+import time
+
+from fbank_load import same_origin_assets
+
+
+LAYOUT_TAGS = ["header", "main", "footer"]
+# Without these no browser test can run; the others are test failures of their own
+BLOCKING_CHECKS = ["Page loading", "Root element"]
+
+
+class PageParser(HTMLParser):
+    """Title, element ids and tags of a page, and whether #root has static content"""
+
+    def __init__(self):
+        super().__init__()
+        self.title = ""
+        self.in_title = False
+        self.in_script = False
+        self.ids = set()
+        self.tags = set()
+        self.inline_scripts = []
+        self.root_tag = None
+        self.root_depth = 0
+        self.root_elements = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        self.tags.add(tag)
+        if attrs.get("id"):
+            self.ids.add(attrs["id"])
+
+        if self.root_depth:
+            self.root_elements += 1
+            if tag == self.root_tag:
+                self.root_depth += 1
+        elif attrs.get("id") == "root":
+            self.root_tag = tag
+            self.root_depth = 1
+
+        self.in_title = tag == "title"
+        if tag == "script" and not attrs.get("src"):
+            self.in_script = True
+            self.inline_scripts.append("")
+
+    def handle_endtag(self, tag):
+        if self.root_depth and tag == self.root_tag:
+            self.root_depth -= 1
+        if tag == "title":
+            self.in_title = False
+        elif tag == "script":
+            self.in_script = False
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title += data
+        elif self.in_script:
+            self.inline_scripts[-1] += data
+
+
+def fetch(url, timeout):
+    with urlopen(url, timeout=timeout) as response:
+        return response.status, response.headers.get_content_type(), response.read()
+
+
+def run_smoke(page_url, timeout=5.0):
+    """(passed, [(check, passed, details)], seconds) for the static checks of the page"""
+    start = time.perf_counter()
+    checks = []
+
+    def check(name, passed, details=""):
+        checks.append((name, passed, details))
+        return passed
+
+    try:
+        status, content_type, body = fetch(page_url, timeout)
+    except HTTPError as e:
+        check("Page loading", False, f"HTTP {e.code}")
+        return False, checks, time.perf_counter() - start
+    except (URLError, OSError) as e:
+        check("Page loading", False, f"{page_url} is not reachable: {getattr(e, 'reason', e)}")
+        return False, checks, time.perf_counter() - start
+    check("Page loading", content_type == "text/html", f"HTTP {status}, {content_type}")
+
+    html = body.decode("utf-8", "replace")
+    page = PageParser()
+    page.feed(html)
+    check("Title", "F-Bank" in page.title, f"title {page.title.strip()!r}")
+    check("Root element", "root" in page.ids)
+
+    bundle = list(page.inline_scripts)
+    assets = same_origin_assets(page_url, html)
+    broken = []
+    for asset in assets:
+        try:
+            _, _, asset_body = fetch(urljoin(page_url, asset), timeout)
+        except (URLError, OSError) as e:
+            broken.append(f"{asset} ({getattr(e, 'code', None) or getattr(e, 'reason', e)})")
+            continue
+        if not asset_body:
+            broken.append(f"{asset} (empty)")
+        elif asset.split("?")[0].endswith(".js"):
+            bundle.append(asset_body.decode("utf-8", "replace"))
+    check("Bundle", not broken and bool(bundle),
+          f"broken: {', '.join(broken)}" if broken else f"{len(assets)} assets, {len(bundle)} scripts")
+
+    if page.root_elements:
+        # Rendered on the server or static: the markup itself answers the layout checks
+        check("Root content", True, f"{page.root_elements} static elements")
+        missing = [tag for tag in LAYOUT_TAGS if tag not in page.tags]
+        check("Layout elements", not missing, f"missing: {', '.join(missing)}" if missing else "in markup")
+    else:
+        # Rendered client-side: the bundle must at least create the elements
+        source = "\n".join(bundle)
+        missing = [tag for tag in LAYOUT_TAGS if not re.search(r"[\"'`]%s[\"'`]" % tag, source)]
+        check("Layout elements", not missing,
+              f"not referenced by the bundle: {', '.join(missing)}" if missing else "referenced by the bundle")
+
+    passed = all(passed for _, passed, _ in checks)
+    return passed, checks, time.perf_counter() - start
+
+
+def target_usable(checks):
+    """Whether the blocking checks passed: the page loads and has a #root"""
+    results = {name: passed for name, passed, _ in checks}
+    return all(results.get(name, False) for name in BLOCKING_CHECKS)
+
+
+def print_smoke(checks, seconds):
+    print(f"Smoke checks ({seconds * 1000:.0f}ms):")
+    for name, passed, details in checks:
+        status = "PASSED" if passed else "FAILED"
+        print(f"- {name} - {status}" + (f" | {details}" if details else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Browserless F-Bank smoke checks")
+    parser.add_argument("--url", default="http://localhost:3000")
+    args = parser.parse_args()
+
+    passed, checks, seconds = run_smoke(args.url)
+    print_smoke(checks, seconds)
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,168 @@
+"""Soak mode: one transfer form driven for thousands of iterations.
+
+The enter_amount / get_commission_value / is_transfer_possible loop runs
+in a single page load while the page's JS heap (after a forced GC), DOM
+node and event listener counts, the Chrome processes' RSS and this
+process's RSS are sampled at intervals. The samples are written as a CSV
+time series, and a metric whose windowed medians only ever go up is
+flagged as a likely leak in the app or in the harness.
+"""
+from statistics import median
+import csv
+import os
+import time
+
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+SOAK_FIELDS = ["iteration", "elapsed", "js_heap_used", "dom_nodes", "event_listeners", "chrome_rss",
+               "python_rss", "iteration_p50", "failures"]
+# Metrics where steady growth means a leak; the rest are context
+LEAK_METRICS = ["js_heap_used", "dom_nodes", "event_listeners", "chrome_rss", "python_rss"]
+
+
+def process_rss(pid="self"):
+    """Resident set size in bytes from /proc; None where that is not available"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def descendant_pids(root):
+    """All processes below root, found through the parent pids in /proc/*/stat"""
+    children = {}
+    try:
+        entries = [name for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return []
+    for name in entries:
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # The command name may contain spaces, so split after its closing parenthesis
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    found, stack = [], [root]
+    while stack:
+        for pid in children.get(stack.pop(), []):
+            found.append(pid)
+            stack.append(pid)
+    return found
+
+
+def chrome_rss(driver):
+    """Summed RSS of every process chromedriver started: browser, renderers, GPU"""
+    try:
+        root = driver.service.process.pid
+    except AttributeError:
+        return None
+    sizes = [process_rss(pid) for pid in descendant_pids(root)]
+    sizes = [size for size in sizes if size is not None]
+    return sum(sizes) if sizes else None
+
+
+def page_metrics(driver):
+    """JS heap after a forced GC plus DOM node and listener counts, via CDP Performance"""
+    try:
+        driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except Exception as e:
+        print(f"Performance metrics unavailable: {e}")
+        return {}
+    values = {metric["name"]: metric["value"] for metric in metrics}
+    return {
+        "js_heap_used": values.get("JSHeapUsedSize"),
+        "dom_nodes": values.get("Nodes"),
+        "event_listeners": values.get("JSEventListeners"),
+    }
+
+
+def growing(values, windows=5, tolerance=0.05):
+    """True if the medians of consecutive windows never drop and end tolerance above the start"""
+    values = [value for value in values if value is not None]
+    if len(values) < windows * 2:
+        return False
+    size = len(values) // windows
+    medians = [median(values[i * size:(i + 1) * size]) for i in range(windows)]
+    rising = all(later >= earlier for earlier, later in zip(medians, medians[1:]))
+    return rising and medians[-1] > medians[0] * (1 + tolerance)
+
+
+def write_series(path, samples):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SOAK_FIELDS)
+        writer.writeheader()
+        writer.writerows(samples)
+
+
+def run_soak(tester, iterations=5000, sample_every=100, output="soak.csv"):
+    """Drive the form loop in one session and flag metrics that grow monotonically"""
+    print("F-BANK SOAK TEST")
+    print("=" * 70)
+
+    if not tester.check_target():
+        return False
+
+    if tester.profile.browser != "chrome":
+        # Heap, node and listener counts come from the Chrome DevTools Protocol
+        print(f"Soak mode needs Chrome, running it in Chrome instead of {tester.profile.browser}")
+        tester.profile = tester.profile.with_browser("chrome")
+
+    if not tester.setup():
+        print("Failed to initialize test environment")
+        return False
+
+    samples = []
+    try:
+        failure = tester.prepare_transfer_form()
+        if failure:
+            print(f"{failure[0]}: {failure[1]}")
+            return False
+
+        tester.driver.execute_cdp_cmd("Performance.enable", {})
+        start = time.perf_counter()
+        failures = 0
+        durations = []
+        for iteration in range(1, iterations + 1):
+            iteration_start = time.perf_counter()
+            amount = str(100 + iteration % 9000)
+            if not tester.enter_amount(amount):
+                failures += 1
+            elif tester.get_commission_value(default=None) is None:
+                failures += 1
+            else:
+                tester.is_transfer_possible()
+            durations.append(time.perf_counter() - iteration_start)
+
+            if iteration % sample_every == 0 or iteration == iterations:
+                # Drop per-call timing events and flush new wait latencies, or the harness's
+                # own bookkeeping would show up as a leak
+                tester.timer.events = []
+                tester.timeouts.save()
+                sample = dict(page_metrics(tester.driver), iteration=iteration,
+                              elapsed=round(time.perf_counter() - start, 3),
+                              chrome_rss=chrome_rss(tester.driver), python_rss=process_rss(),
+                              iteration_p50=round(median(durations), 4), failures=failures)
+                samples.append(sample)
+                durations = []
+                print(f"{iteration}/{iterations}: heap {sample.get('js_heap_used')}, "
+                      f"nodes {sample.get('dom_nodes')}, chrome rss {sample['chrome_rss']}, "
+                      f"python rss {sample['python_rss']}, p50 {sample['iteration_p50'] * 1000:.1f}ms")
+    finally:
+        tester.teardown()
+        if samples:
+            write_series(output, samples)
+            print(f"\nTime series written to {output}")
+
+    leaks = [metric for metric in LEAK_METRICS if growing([sample.get(metric) for sample in samples])]
+    if growing([sample["iteration_p50"] for sample in samples]):
+        print("Iteration latency grows over the session")
+    for metric in leaks:
+        first, last = samples[0].get(metric), samples[-1].get(metric)
+        print(f"Monotonic growth in {metric}: {first} -> {last}")
+    if not leaks:
+        print("No monotonic memory growth detected")
+    return not leaks and failures == 0
@@ -0,0 +1,102 @@
+"""Exhaustive commission/availability sweep for the F-Bank transfer form.
+
+A whole amount range goes through the app in batched in-page probes and is
+compared against a NumPy reference of the rule from Berezhnaya_SECOND.md:
+commission is 10 % of the amount rounded down, and a transfer is possible
+while amount + commission fits into balance - reserved.
+"""
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+
+def reference(amounts, balance, reserved):
+    """Expected (commission, transfer_possible) arrays for the given amounts"""
+    amounts = np.asarray(amounts, dtype=np.int64)
+    # Integer arithmetic: 10 % rounded down without float error at the boundaries
+    commission = amounts // 10
+    possible = (amounts > 0) & (amounts + commission <= balance - reserved)
+    return commission, possible
+
+
+def group_ranges(values):
+    """Collapse sorted integers into inclusive (first, last) runs"""
+    values = np.asarray(values, dtype=np.int64)
+    if values.size == 0:
+        return []
+
+    breaks = np.flatnonzero(np.diff(values) != 1)
+    firsts = np.concatenate(([values[0]], values[breaks + 1]))
+    lasts = np.concatenate((values[breaks], [values[-1]]))
+    return list(zip(firsts.tolist(), lasts.tolist()))
+
+
+def account_state(url):
+    """balance and reserved from a ?balance=&reserved= page URL"""
+    query = parse_qs(urlparse(url).query)
+    return int(query.get("balance", ["0"])[0]), int(query.get("reserved", ["0"])[0])
+
+
+def collect(tester, amounts, chunk_size):
+    """Drive amounts through the app; returns (commission, possible) arrays or None"""
+    commission = np.zeros(len(amounts), dtype=np.int64)
+    possible = np.zeros(len(amounts), dtype=bool)
+
+    for offset in range(0, len(amounts), chunk_size):
+        chunk = amounts[offset:offset + chunk_size]
+        probes = tester.probe_amounts(chunk.tolist())
+        if probes is None:
+            return None
+
+        end = offset + len(chunk)
+        commission[offset:end] = [probe["commission"] for probe in probes]
+        possible[offset:end] = [probe["transfer_possible"] and probe["error_text"] is None
+                                for probe in probes]
+        print(f"Swept {end}/{len(amounts)} amounts")
+
+    return commission, possible
+
+
+def report_mismatches(label, amounts, mask, actual, expected):
+    ranges = group_ranges(amounts[mask])
+    print(f"\n{label}: {int(mask.sum())} mismatching amounts in {len(ranges)} ranges")
+
+    lookup = {int(amount): index for index, amount in enumerate(amounts)}
+    for first, last in ranges:
+        index = lookup[first]
+        span = f"{first}" if first == last else f"{first}..{last}"
+        print(f"- {span}: app {actual[index]}, expected {expected[index]} (at {first})")
+
+
+def run_sweep(tester, first, last, chunk_size=1000):
+    """Sweep amounts first..last through the form and compare with the reference"""
+    print("F-BANK COMMISSION SWEEP")
+    print("=" * 70)
+
+    if not tester.setup():
+        print("Failed to initialize test environment")
+        return False
+
+    try:
+        if not tester.open_transfer_form() or not tester.enter_card_number():
+            print("Failed to open transfer form")
+            return False
+
+        amounts = np.arange(first, last + 1, dtype=np.int64)
+        collected = collect(tester, amounts, chunk_size)
+        if collected is None:
+            print("Failed to enter amount")
+            return False
+
+        actual_commission, actual_possible = collected
+        balance, reserved = account_state(tester.base_url)
+        expected_commission, expected_possible = reference(amounts, balance, reserved)
+
+        commission_mask = actual_commission != expected_commission
+        possible_mask = actual_possible != expected_possible
+        report_mismatches("Commission", amounts, commission_mask, actual_commission, expected_commission)
+        report_mismatches("Availability", amounts, possible_mask, actual_possible, expected_possible)
+
+        return not commission_mask.any() and not possible_mask.any()
+    finally:
+        tester.teardown()
@@ -0,0 +1,228 @@
+"""Concurrent multi-tab scenario driving inside a single Chrome.
+
+One browser is launched through Selenium and then driven directly over
+the Chrome DevTools Protocol from asyncio. Every scenario gets its own
+browser context (separate cookies and storage) and tab, loads the page
+with its own ?balance=&reserved= parameters and runs the same in-page
+scripts as the Selenium helpers. Outcomes are decided by the same
+fbank_verdicts rules as in FBankAutotests. Many scenarios then share the
+memory of one Chrome instead of one browser each.
+"""
+from urllib.parse import urlparse
+from urllib.request import urlopen
+import asyncio
+import itertools
+import json
+import threading
+
+import websocket
+
+from fbank_browser import create_driver
+from fbank_page import ERROR_WORDS, OPEN_FORM_SCRIPT, PROBE_SCRIPT, WAIT_SCRIPT
+from fbank_scenarios import SCENARIOS
+from fbank_selectors import (AMOUNT_INPUT_SELECTORS, CARD_INPUT_SELECTORS, COMMISSION_SELECTORS,
+                             TRANSFER_ACCOUNT_SELECTORS, TRANSFER_BUTTON_SELECTORS, SelectorResolver)
+from fbank_verdicts import (actual_available_amount, available_amount_calculation, balance_not_found, balance_texts,
+                            commission_calculation, commission_rounding, probed_amounts, validation_boundary_values)
+
+
+OPEN_FORM_FAILURES = {
+    "account": ("Form opening", "Failed to open transfer form"),
+    "card": ("Card input", "Failed to enter card number"),
+}
+
+# The rule deciding each case from the probes of its amounts, as in the FBankAutotests tests
+RULES = {
+    "FBT-006": lambda probes: available_amount_calculation(probes[0]["commission"]),
+    "FBT-007": actual_available_amount,
+    "FBT-008": commission_calculation,
+    "FBT-009": commission_rounding,
+    "FBT-010": validation_boundary_values,
+}
+
+
+def call_script(script, *args):
+    """Expression running an execute_async_script-style script and awaiting its callback"""
+    return ("new Promise(resolve => (function () {\n%s\n}).apply(null, %s.concat([resolve])))"
+            % (script, json.dumps(list(args), ensure_ascii=False)))
+
+
+class CDPConnection:
+    """Browser-level CDP websocket; responses and events are handed to the asyncio loop"""
+
+    def __init__(self, ws_url, loop):
+        # Chrome rejects websocket handshakes with an Origin header it does not allow
+        self.ws = websocket.create_connection(ws_url, suppress_origin=True)
+        self.loop = loop
+        self.ids = itertools.count(1)
+        self.pending = {}
+        self.listeners = {}
+        self.reader = threading.Thread(target=self.read_loop, daemon=True)
+        self.reader.start()
+
+    def read_loop(self):
+        while True:
+            try:
+                message = json.loads(self.ws.recv())
+            except Exception as e:
+                self.loop.call_soon_threadsafe(self.fail_all, e)
+                return
+            self.loop.call_soon_threadsafe(self.dispatch, message)
+
+    def dispatch(self, message):
+        if "id" in message:
+            future = self.pending.pop(message["id"], None)
+            if future is None or future.done():
+                return
+            if "error" in message:
+                future.set_exception(RuntimeError(message["error"].get("message", "CDP error")))
+            else:
+                future.set_result(message.get("result", {}))
+            return
+
+        key = (message.get("sessionId"), message.get("method"))
+        for future in self.listeners.pop(key, []):
+            if not future.done():
+                future.set_result(message.get("params", {}))
+
+    def fail_all(self, error):
+        for future in list(self.pending.values()) + [f for fs in self.listeners.values() for f in fs]:
+            if not future.done():
+                future.set_exception(RuntimeError(f"CDP connection lost: {error}"))
+        self.pending.clear()
+        self.listeners.clear()
+
+    async def send(self, method, params=None, session_id=None):
+        message_id = next(self.ids)
+        future = self.loop.create_future()
+        self.pending[message_id] = future
+
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        self.ws.send(json.dumps(message))
+        return await future
+
+    def event(self, session_id, method):
+        """Future for the next event; register it before triggering the event"""
+        future = self.loop.create_future()
+        self.listeners.setdefault((session_id, method), []).append(future)
+        return future
+
+    async def evaluate(self, session_id, expression, timeout=30):
+        response = await asyncio.wait_for(self.send("Runtime.evaluate", {
+            "expression": expression,
+            "awaitPromise": True,
+            "returnByValue": True,
+        }, session_id), timeout)
+        if "exceptionDetails" in response:
+            details = response["exceptionDetails"]
+            raise RuntimeError(details.get("exception", {}).get("description", details.get("text")))
+        return response["result"].get("value")
+
+    def close(self):
+        self.ws.close()
+
+
+async def run_scenario(cdp, scenario, origin, selectors):
+    """Drive one scenario in its own browser context; returns (step, passed, details)"""
+    context_id = (await cdp.send("Target.createBrowserContext"))["browserContextId"]
+    target_id = (await cdp.send("Target.createTarget", {"url": "about:blank",
+                                                        "browserContextId": context_id}))["targetId"]
+    try:
+        session_id = (await cdp.send("Target.attachToTarget", {"targetId": target_id,
+                                                               "flatten": True}))["sessionId"]
+        await cdp.send("Page.enable", {}, session_id)
+        # Keep timers running at foreground rate although the tab is not focused
+        await cdp.send("Emulation.setFocusEmulationEnabled", {"enabled": True}, session_id)
+
+        loaded = cdp.event(session_id, "Page.loadEventFired")
+        await cdp.send("Page.navigate", {"url": f"{origin}/{scenario.query()}"}, session_id)
+        await asyncio.wait_for(loaded, 30)
+
+        if scenario.test_id == "FBT-006":
+            for text in balance_texts(scenario.test_id):
+                shown = await cdp.evaluate(session_id, call_script(WAIT_SCRIPT, {"kind": "text", "words": [text]},
+                                                                   10000, 0))
+                if not shown:
+                    return balance_not_found(scenario.test_id)
+
+        failure = await cdp.evaluate(session_id, call_script(OPEN_FORM_SCRIPT, selectors,
+                                                             scenario.card_number, 10000))
+        if failure:
+            step, details = OPEN_FORM_FAILURES.get(failure, ("Form opening", failure))
+            return step, False, details
+
+        amounts = probed_amounts(scenario.test_id)
+        results = await cdp.evaluate(session_id, call_script(PROBE_SCRIPT, amounts, selectors, ERROR_WORDS))
+        if results is None:
+            return "Amount input", False, "Failed to enter amount"
+        return RULES[scenario.test_id](results)
+    finally:
+        try:
+            await cdp.send("Target.closeTarget", {"targetId": target_id})
+            await cdp.send("Target.disposeBrowserContext", {"browserContextId": context_id})
+        except RuntimeError as e:
+            print(f"Tab cleanup error for {scenario.test_id}: {e}")
+
+
+async def run_all(ws_url, scenarios, origin, selectors, tabs):
+    cdp = CDPConnection(ws_url, asyncio.get_running_loop())
+    limit = asyncio.Semaphore(tabs)
+
+    async def bounded(scenario):
+        async with limit:
+            try:
+                return await run_scenario(cdp, scenario, origin, selectors)
+            except Exception as e:
+                return "Test execution", False, f"Error: {e}"
+
+    try:
+        return await asyncio.gather(*(bounded(scenario) for scenario in scenarios))
+    finally:
+        cdp.close()
+
+
+def run_tabs(tester, tabs=8, scenarios=SCENARIOS):
+    """Run scenarios concurrently in tabs of one browser and log them on tester"""
+    print("F-BANK AUTOMATED TEST SUITE (multi-tab)")
+    print("=" * 70)
+
+    if not tester.check_target():
+        return False
+
+    profile = tester.profile
+    if profile.browser != "chrome":
+        # Tabs are driven over the Chrome DevTools Protocol
+        print(f"Multi-tab mode needs Chrome, running it in Chrome instead of {profile.browser}")
+        profile = profile.with_browser("chrome")
+
+    driver = create_driver(profile)
+    try:
+        debugger_address = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+        if not debugger_address:
+            print("Chrome did not report a DevTools debugger address, cannot drive tabs")
+            return False
+        with urlopen(f"http://{debugger_address}/json/version") as response:
+            ws_url = json.load(response)["webSocketDebuggerUrl"]
+
+        resolver = SelectorResolver(driver)
+        selectors = {
+            "account": resolver.ordered("transfer_account", TRANSFER_ACCOUNT_SELECTORS),
+            "card": resolver.ordered("card_input", CARD_INPUT_SELECTORS),
+            "amount": resolver.ordered("amount_input", AMOUNT_INPUT_SELECTORS),
+            "commission": resolver.ordered("commission", COMMISSION_SELECTORS),
+            "button": resolver.ordered("transfer_button", TRANSFER_BUTTON_SELECTORS),
+        }
+        parsed = urlparse(tester.base_url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+
+        print(f"Running {len(scenarios)} scenarios in up to {tabs} tabs of one browser")
+        outcomes = asyncio.run(run_all(ws_url, scenarios, origin, selectors, tabs))
+    finally:
+        driver.quit()
+
+    for scenario, (step, passed, details) in zip(scenarios, outcomes):
+        tester.log_test_result(scenario.test_id, step, passed, details)
+
+    return tester.print_summary()
@@ -0,0 +1,113 @@
+"""Adaptive wait timeouts for the F-Bank autotests.
+
+Instead of a fixed 10 s ceiling, every wait key (an element, a condition)
+gets a timeout derived from the latencies observed for it in earlier runs
+against the same target origin: a high percentile times a safety factor
+plus a margin, never above the ceiling. A wait that times out is kept as
+a censored sample and puts its key back on the ceiling for the rest of
+the run. Each test also gets an overall time budget that caps its waits.
+"""
+from urllib.parse import urlparse
+import os
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+from fbank_cache import CACHE_DIR, load_store, update_store
+from fbank_timing import TimedWait, percentile
+
+
+LATENCY_HISTORY = os.path.join(CACHE_DIR, "latencies.json")
+TEST_BUDGET = float(os.environ.get("FBANK_TEST_BUDGET", "60"))
+
+
+class TimeoutManager:
+    def __init__(self, target=None, path=LATENCY_HISTORY, ceiling=10.0, floor=0.5, pct=99, factor=1.5,
+                 margin=0.5, min_samples=5, max_samples=200):
+        parsed = urlparse(target or "")
+        # Latencies of one app say nothing about another, so history is kept per origin
+        self.origin = f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else "default"
+        self.path = path
+        self.ceiling = ceiling
+        self.floor = floor
+        self.pct = pct
+        self.factor = factor
+        self.margin = margin
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.latencies = self.load().get(self.origin, {})
+        self.added = {}
+        self.missed = set()
+        self.deadline = None
+
+    def load(self):
+        """{origin: {key: [seconds]}}"""
+        return {origin: keys for origin, keys in load_store(self.path).items() if isinstance(keys, dict)}
+
+    def save(self):
+        if not self.added:
+            return
+
+        def merge(history):
+            history = {origin: keys for origin, keys in history.items() if isinstance(keys, dict)}
+            latencies = history.setdefault(self.origin, {})
+            # Only this run's samples: other workers may have saved theirs since we loaded
+            for key, samples in self.added.items():
+                latencies[key] = (latencies.get(key, []) + samples)[-self.max_samples:]
+            return history
+
+        update_store(self.path, merge)
+        self.added = {}
+
+    def observe(self, key, seconds, timed_out=False):
+        """Record how long a wait for key took.
+
+        A timed-out wait only says the latency was at least this long; it is
+        kept as such a sample and key's waits use the ceiling from then on.
+        """
+        sample = round(seconds, 4)
+        samples = self.latencies.setdefault(key, [])
+        samples.append(sample)
+        del samples[:-self.max_samples]
+        self.added.setdefault(key, []).append(sample)
+        if timed_out:
+            self.missed.add(key)
+
+    def timeout_for(self, key):
+        samples = self.latencies.get(key, [])
+        if key in self.missed or len(samples) < self.min_samples:
+            timeout = self.ceiling
+        else:
+            learned = percentile(samples, self.pct) * self.factor + self.margin
+            timeout = min(self.ceiling, max(self.floor, learned))
+
+        if self.deadline is not None:
+            timeout = min(timeout, max(0.0, self.deadline - time.monotonic()))
+        return timeout
+
+    def start_budget(self, seconds=TEST_BUDGET):
+        self.deadline = time.monotonic() + seconds
+
+    def end_budget(self):
+        self.deadline = None
+
+
+class AdaptiveWait(TimedWait):
+    """WebDriverWait whose timeout comes from a TimeoutManager key on every until()"""
+
+    def __init__(self, driver, timeouts, key, timer=None):
+        super().__init__(driver, timeouts.ceiling, timer)
+        self.timeouts = timeouts
+        self.key = key
+
+    def until(self, method, message=""):
+        self._timeout = self.timeouts.timeout_for(self.key)
+        start = time.perf_counter()
+        try:
+            result = super().until(method, message)
+        except TimeoutException:
+            self.timeouts.observe(self.key, time.perf_counter() - start, timed_out=True)
+            raise
+        self.timeouts.observe(self.key, time.perf_counter() - start)
+        return result
+
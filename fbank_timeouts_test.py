@@ -0,0 +1,73 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from fbank_timeouts import AdaptiveWait, TimeoutManager
+
+
+@pytest.fixture
+def timeouts(tmp_path):
+    return TimeoutManager("http://localhost:3000/", path=str(tmp_path / "latencies.json"))
+
+
+class TestTimeoutManager:
+    def test_ceiling_until_enough_samples(self, timeouts):
+        for _ in range(timeouts.min_samples - 1):
+            timeouts.observe("root", 0.2)
+        assert timeouts.timeout_for("root") == timeouts.ceiling
+
+    def test_learned_timeout(self, timeouts):
+        for _ in range(timeouts.min_samples):
+            timeouts.observe("root", 0.2)
+        assert timeouts.timeout_for("root") == pytest.approx(0.2 * 1.5 + 0.5)
+
+    def test_floor_and_ceiling(self, timeouts):
+        for _ in range(timeouts.min_samples):
+            timeouts.observe("fast", 0.0)
+            timeouts.observe("slow", 30.0)
+        assert timeouts.timeout_for("fast") == pytest.approx(max(timeouts.floor, timeouts.margin))
+        assert timeouts.timeout_for("slow") == timeouts.ceiling
+
+    def test_timeout_forces_ceiling(self, timeouts):
+        for _ in range(timeouts.min_samples):
+            timeouts.observe("root", 0.2)
+        timeouts.observe("root", 0.8, timed_out=True)
+        assert timeouts.timeout_for("root") == timeouts.ceiling
+
+    def test_budget_caps_timeout(self, timeouts):
+        timeouts.start_budget(2.0)
+        assert timeouts.timeout_for("root") <= 2.0
+        timeouts.start_budget(0)
+        assert timeouts.timeout_for("root") == 0.0
+        timeouts.end_budget()
+        assert timeouts.timeout_for("root") == timeouts.ceiling
+
+    def test_history_is_kept_per_origin(self, timeouts):
+        for _ in range(timeouts.min_samples):
+            timeouts.observe("root", 0.2)
+        timeouts.save()
+        assert len(TimeoutManager("http://localhost:3000/other", path=timeouts.path).latencies["root"]) == 5
+        assert TimeoutManager("http://localhost:8000/", path=timeouts.path).latencies == {}
+
+    def test_save_keeps_samples_of_other_workers(self, timeouts):
+        other = TimeoutManager("http://localhost:3000/", path=timeouts.path)
+        other.observe("root", 0.1)
+        other.save()
+        timeouts.observe("root", 0.3)
+        timeouts.save()
+        assert TimeoutManager("http://localhost:3000/", path=timeouts.path).latencies["root"] == [0.1, 0.3]
+
+
+class TestAdaptiveWait:
+    def test_success_is_observed(self, timeouts):
+        AdaptiveWait(object(), timeouts, "root").until(lambda driver: True)
+        assert len(timeouts.latencies["root"]) == 1
+        assert "root" not in timeouts.missed
+
+    def test_timeout_is_observed_as_miss(self, tmp_path):
+        timeouts = TimeoutManager(path=str(tmp_path / "latencies.json"), floor=0.01, margin=0.0)
+        for _ in range(timeouts.min_samples):
+            timeouts.observe("root", 0.01)
+        with pytest.raises(TimeoutException):
+            AdaptiveWait(object(), timeouts, "root").until(lambda driver: False)
+        assert "root" in timeouts.missed
+        assert timeouts.timeout_for("root") == timeouts.ceiling
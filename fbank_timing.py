@@ -0,0 +1,170 @@
+"""Per-step timing events and machine-readable reports for the F-Bank autotests.
+
+Every helper call, selector race and wait is recorded as a structured
+event with its duration, so a slow run can be traced to browser startup,
+selector fallbacks or app rendering. Results export as JSON and JUnit XML
+with per-step p50/p95 aggregates.
+"""
+from contextlib import contextmanager
+from xml.etree import ElementTree
+import functools
+import json
+import math
+import time
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+def percentile(values, pct):
+    """Linearly interpolated percentile of a list of numbers (pct in 0..100)"""
+    values = sorted(values)
+    if not values:
+        return 0.0
+
+    rank = (len(values) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+class StepTimer:
+    def __init__(self):
+        self.events = []
+        self.active = []
+        self.current_test = None
+
+    @contextmanager
+    def step(self, name, **info):
+        """Time a block; the yielded dict can be updated with extra fields such as ok"""
+        event = {"test": self.current_test, "step": name, "ok": True, "commands": 0}
+        event.update(info)
+        self.active.append(event)
+        start = time.perf_counter()
+        try:
+            yield event
+        except Exception:
+            event["ok"] = False
+            raise
+        finally:
+            event["duration"] = time.perf_counter() - start
+            self.active.remove(event)
+            self.events.append(event)
+
+    def count_command(self):
+        """Charge one WebDriver command to every step that is currently open"""
+        for event in self.active:
+            event["commands"] += 1
+
+    def aggregates(self, events=None):
+        """{step: {count, total, p50, p95}} with durations in seconds"""
+        durations = {}
+        for event in self.events if events is None else events:
+            durations.setdefault(event["step"], []).append(event["duration"])
+
+        return {
+            step: {
+                "count": len(values),
+                "total": sum(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+            }
+            for step, values in sorted(durations.items())
+        }
+
+    def events_for(self, test):
+        return [event for event in self.events if event["test"] == test]
+
+
+def timed(step, ok=None):
+    """Record a helper method as a step; a False/None return marks it not ok
+    unless ok, called with the return value, decides instead"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.timer.step(step) as event:
+                result = method(self, *args, **kwargs)
+                event["ok"] = ok(result) if ok else result is not None and result is not False
+                return result
+        return wrapper
+    return decorate
+
+
+def count_commands(driver, timer):
+    """Charge every WebDriver command of this driver to timer; calling again switches timers"""
+    if getattr(driver, "command_timer", None) is None:
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            driver.command_timer.count_command()
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+    driver.command_timer = timer
+    return driver
+
+
+class TimedWait(WebDriverWait):
+    """WebDriverWait that records every until() call as a "wait" step (if given a timer)"""
+
+    def __init__(self, driver, timeout, timer=None, **kwargs):
+        super().__init__(driver, timeout, **kwargs)
+        self.timer = timer
+
+    def until(self, method, message=""):
+        if self.timer is None:
+            return super().until(method, message)
+        with self.timer.step("wait", condition=getattr(method, "__name__", type(method).__name__)):
+            return super().until(method, message)
+
+
+def build_report(records, timer):
+    tests = []
+    for record in records:
+        events = timer.events_for(record["test"])
+        tests.append(dict(record,
+                          duration=sum(event["duration"] for event in events if event["step"] == "test"),
+                          steps=timer.aggregates(events)))
+
+    return {
+        "passed": sum(1 for record in records if record["passed"]),
+        "total": len(records),
+        "tests": tests,
+        "steps": timer.aggregates(),
+        "events": timer.events,
+    }
+
+
+def write_json(path, records, timer):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_report(records, timer), f, indent=2, ensure_ascii=False)
+
+
+def write_junit(path, records, timer, suite_name="FBankAutotests"):
+    report = build_report(records, timer)
+    suite = ElementTree.Element("testsuite", {
+        "name": suite_name,
+        "tests": str(report["total"]),
+        "failures": str(report["total"] - report["passed"]),
+        "time": f"{sum(test['duration'] for test in report['tests']):.3f}",
+    })
+
+    properties = ElementTree.SubElement(suite, "properties")
+    for step, stats in report["steps"].items():
+        for key in ("p50", "p95"):
+            ElementTree.SubElement(properties, "property",
+                                   {"name": f"{step}.{key}", "value": f"{stats[key]:.3f}"})
+
+    for test in report["tests"]:
+        case = ElementTree.SubElement(suite, "testcase", {
+            "classname": suite_name,
+            "name": f"{test['test_id']}: {test['name']}",
+            "time": f"{test['duration']:.3f}",
+        })
+        if not test["passed"]:
+            ElementTree.SubElement(case, "failure", {"message": test["details"]})
+
+        breakdown = [f"{step}: n={stats['count']} total={stats['total']:.3f}s "
+                     f"p50={stats['p50']:.3f}s p95={stats['p95']:.3f}s"
+                     for step, stats in test["steps"].items()]
+        ElementTree.SubElement(case, "system-out").text = "\n".join(breakdown)
+
+    ElementTree.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,110 @@
+"""Pass/fail rules of FBT-006..FBT-010 on the values read off the transfer form.
+
+FBankAutotests reads the form through Selenium and fbank_tabs through
+CDP, but both decide here, so a case gets the same outcome in every mode.
+Amounts, expected values and the account state come from the compiled
+scenarios (Berezhnaya_SECOND.md). Each rule returns (step, passed,
+details) as passed to log_test_result.
+"""
+from fbank_scenarios import scenario_for
+
+
+# Actual result recorded for FBT-006 (bug report #1): 900 instead of 999 for 9999. Only named in the
+# markdown's free-text results, which the scenario compiler does not read, so it stays a constant
+KNOWN_WRONG_COMMISSION = 900
+
+
+def probed_amounts(test_id):
+    """Amounts of a test case in Berezhnaya_SECOND.md, in the order the rules expect their probes"""
+    return [amount for amount, _, _ in scenario_for(test_id).probes]
+
+
+def balance_texts(test_id):
+    """Balance and reserve of the case's account as the header shows them, e.g. "30'000" """
+    scenario = scenario_for(test_id)
+    return [f"{value:,}".replace(",", "'") for value in (scenario.balance, scenario.reserved)]
+
+
+def balance_not_found(test_id):
+    scenario = scenario_for(test_id)
+    return ("Balance display", False,
+            f"Balance {scenario.balance} or reserve {scenario.reserved} not found")
+
+
+def commission_cases(test_id):
+    """(amount, expected commission) pairs of a test case in Berezhnaya_SECOND.md"""
+    return [(amount, commission) for amount, commission, _ in scenario_for(test_id).probes
+            if commission is not None]
+
+
+def commission_errors(cases, probes):
+    """(amount, actual, expected) for every probe whose commission is wrong"""
+    return [(amount, probe["commission"], expected)
+            for (amount, expected), probe in zip(cases, probes) if probe["commission"] != expected]
+
+
+def available_amount_calculation(commission):
+    """FBT-006: the commission shown for the case's amount"""
+    amount, expected = commission_cases("FBT-006")[0]
+    if commission == KNOWN_WRONG_COMMISSION:
+        return ("Commission calculation", False,
+                f"Commission {commission} RUB instead of {expected} RUB - BUG")
+    if commission == expected:
+        return "Commission calculation", True, f"Commission {expected} RUB - correct"
+    return "Commission calculation", False, f"Commission {commission} RUB instead of {expected} RUB"
+
+
+def transfer_outcome(probe, possible):
+    """Whether a probe shows the expected availability: a possible transfer has a
+    clickable button, a blocked one shows the insufficient-funds error"""
+    return probe["transfer_possible"] if possible else probe["error_text"] is not None
+
+
+def actual_available_amount(probes):
+    """FBT-007: probes of probed_amounts("FBT-007")"""
+    expected = scenario_for("FBT-007").probes
+    outcomes = [transfer_outcome(probe, possible) for (_, _, possible), probe in zip(expected, probes)]
+    if all(outcomes):
+        return "Available amount logic", True, "Transfer logic works correctly"
+    details = ", ".join(f"{amount}: {outcome}" for (amount, _, _), outcome in zip(expected, outcomes))
+    return "Available amount logic", False, f"Logic error: {details}"
+
+
+def commission_calculation(probes):
+    """FBT-008: probes of probed_amounts("FBT-008")"""
+    cases = commission_cases("FBT-008")
+    errors = commission_errors(cases, probes)
+    if not errors:
+        return "Commission calculation", True, "All commissions calculated correctly"
+    return "Commission calculation", False, f"Errors in {len(errors)} out of {len(cases)} test cases"
+
+
+def commission_rounding(probes):
+    """FBT-009: probes of probed_amounts("FBT-009")"""
+    errors = commission_errors(commission_cases("FBT-009"), probes)
+    if errors:
+        return "Rounding algorithm", False, f"Found {len(errors)} rounding errors"
+    return "Rounding algorithm", True, "All rounding calculations correct"
+
+
+def validation_boundary_values(probes):
+    """FBT-010: probes of probed_amounts("FBT-010").
+
+    An amount to reject is accepted when the transfer becomes possible; a
+    negative one already when the amount field keeps it.
+    """
+    validation_errors = []
+    for (amount, commission, possible), probe in zip(scenario_for("FBT-010").probes, probes):
+        if possible is False:
+            negative = amount.startswith("-")
+            accepted = amount in probe["value"] if negative else probe["transfer_possible"]
+            if accepted:
+                kind = "negative" if negative else "zero" if int(amount) == 0 else amount
+                validation_errors.append(f"System accepts {kind} amount")
+        elif possible and not (probe["transfer_possible"] and probe["error_text"] is None):
+            validation_errors.append(f"System rejects amount {amount}")
+        if commission is not None and probe["commission"] != commission:
+            validation_errors.append(f"Commission for {amount} is {probe['commission']} instead of {commission}")
+    if validation_errors:
+        return "Amount validation", False, f"Validation issues: {', '.join(validation_errors)}"
+    return "Amount validation", True, "Amount validation works correctly"
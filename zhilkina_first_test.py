@@ -1,21 +1,139 @@
 import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import os
 import time
 
+from conftest import POOL_REPORTS
+from fbank_browser import LaunchProfile, create_driver
+from fbank_server import StandInServer
+from fbank_smoke import print_smoke, run_smoke, target_usable
+from fbank_timeouts import AdaptiveWait, TimeoutManager
+
+BASE_URL = os.environ.get("FBANK_URL", "http://localhost:3000")
+MAX_DRIVER_USES = int(os.environ.get("FBANK_DRIVER_MAX_USES", "20"))
+
+
+class DriverPool:
+    """One warm browser per pytest session (or xdist worker), reset between tests"""
+
+    def __init__(self, base_url=BASE_URL, max_uses=MAX_DRIVER_USES, profile=None):
+        self.base_url = base_url
+        self.profile = profile or LaunchProfile.from_env()
+        self.max_uses = max_uses
+        self.driver = None
+        self.uses = 0
+        self.launches = 0
+        self.launch_time = 0.0
+        self.tests_served = 0
+
+    def launch(self):
+        start = time.perf_counter()
+        self.driver = create_driver(self.profile)
+        self.launch_time += time.perf_counter() - start
+        self.launches += 1
+        self.uses = 0
+
+    def recycle(self):
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        self.driver = None
+
+    def is_alive(self):
+        try:
+            self.driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def reset(self):
+        # Storage can only be cleared on the app's origin, so load it first
+        self.driver.get(self.base_url)
+        self.driver.delete_all_cookies()
+        self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        self.driver.get(self.base_url)
+
+    def acquire(self):
+        if self.driver is None or self.uses >= self.max_uses or not self.is_alive():
+            self.recycle()
+            self.launch()
+
+        try:
+            self.reset()
+        except Exception:
+            # Browser died between the liveness check and the reset
+            self.recycle()
+            self.launch()
+            self.reset()
+
+        self.uses += 1
+        self.tests_served += 1
+        return self.driver
+
+    def report(self):
+        if not self.launches:
+            return "Driver pool: no browsers launched"
+        avg_launch = self.launch_time / self.launches
+        saved = (self.tests_served - self.launches) * avg_launch
+        return (f"Driver pool: {self.launches} browser launch(es) for {self.tests_served} tests, "
+                f"avg startup {avg_launch:.2f}s, ~{saved:.2f}s of startup saved")
+
+
+@pytest.fixture(scope="session")
+def base_url():
+    """The app under test; FBANK_LOCAL_SERVER=1 serves the local stand-in instead"""
+    if os.environ.get("FBANK_LOCAL_SERVER") != "1":
+        yield BASE_URL
+        return
+
+    with StandInServer(bundle_dir=os.environ.get("FBANK_BUNDLE_DIR")) as server:
+        yield server.page_url()
+
+
+@pytest.fixture(scope="session")
+def timeouts(base_url):
+    manager = TimeoutManager(base_url)
+    yield manager
+    manager.save()
+
+
+@pytest.fixture(scope="session")
+def smoke(base_url):
+    """Browserless fast tier: only an unreachable page or one without #root skips the browser tier;
+    title, layout and bundle findings are left to the tests that check them"""
+    _, checks, seconds = run_smoke(base_url)
+    print_smoke(checks, seconds)
+    if not target_usable(checks):
+        failed = "; ".join(f"{name}: {details}" for name, passed, details in checks if not passed)
+        pytest.fail(f"Target is not reachable or has no #root, skipping the browser tier: {failed}")
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, base_url, smoke):
+    # A broken target fails every test immediately instead of after its waits
+    pool = DriverPool(base_url)
+    yield pool
+    pool.recycle()
+    request.config.stash.setdefault(POOL_REPORTS, []).append(pool.report())
+
+
 class TestFBank:
     @pytest.fixture(scope="function")
-    def setup(self):
-        self.driver = webdriver.Chrome()
-        self.driver.maximize_window()
-        self.driver.get("http://localhost:3000")
-        self.wait = WebDriverWait(self.driver, 10)
+    def setup(self, driver_pool, timeouts):
+        self.driver = driver_pool.acquire()
+        self.base_url = driver_pool.base_url
+        self.timeouts = timeouts
+        self.timer = None
         yield
-        self.driver.quit()
+
+    def waiter(self, key):
+        """WebDriverWait whose timeout is learned for this key"""
+        return AdaptiveWait(self.driver, self.timeouts, key, self.timer)
 
     def test_1_page_loading(self, setup):
         """Test 1: Page loading and basic elements"""
@@ -23,13 +141,13 @@ class TestFBank:
         assert "F-Bank" in self.driver.title
 
         # Check root element presence
-        root_element = self.wait.until(
+        root_element = self.waiter("root").until(
             EC.presence_of_element_located((By.ID, "root"))
         )
         assert root_element.is_displayed()
 
         # Wait for application content loading with explicit wait
-        self.wait.until(
+        self.waiter("root_content").until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "#root > *"))
         )
         
@@ -47,7 +165,7 @@ class TestFBank:
         ]
         
         for by, value in elements_to_check:
-            element = self.wait.until(
+            element = self.waiter(value).until(
                 EC.presence_of_element_located((by, value))
             )
             assert element.is_displayed()
@@ -55,7 +173,7 @@ class TestFBank:
     def test_3_button_interaction(self, setup):
         """Test 3: Button interaction"""
         # Find all buttons on page
-        buttons = self.wait.until(
+        buttons = self.waiter("buttons").until(
             EC.presence_of_all_elements_located((By.TAG_NAME, "button"))
         )
         assert len(buttons) > 0
@@ -68,7 +186,7 @@ class TestFBank:
     def test_4_input_fields(self, setup):
         """Test 4: Input fields verification"""
         # Find input fields
-        inputs = self.wait.until(
+        inputs = self.waiter("inputs").until(
             EC.presence_of_all_elements_located((By.TAG_NAME, "input"))
         )
         
@@ -93,10 +211,10 @@ class TestFBank:
         assert "localhost" in current_url or "3000" in current_url
         
         # Navigate to URL instead of using refresh
-        self.driver.get("http://localhost:3000")
+        self.driver.get(self.base_url)
         
         # Verify page loaded after navigation
-        root_element = self.wait.until(
+        root_element = self.waiter("root").until(
             EC.presence_of_element_located((By.ID, "root"))
         )
         assert root_element.is_displayed()